@@ -8,7 +8,7 @@ Human Oversight module providing approval gate functionality for AI agents.
 This module enables sensitive operations performed by AI agents to be reviewed 
 and approved by human operators before execution. It provides:
 
-1. A decorator for wrapping sensitive functions with approval workflows
+1. Decorators for wrapping sensitive functions and coroutines with approval workflows
 2. Services for sending and receiving approval requests
 3. Comprehensive logging of the approval process
 
@@ -23,9 +23,21 @@ Usage:
     def delete_user(user_id):
         # This function will only execute after human approval
         ...
+
+    Coroutine functions use `approval_gate_async` with the same arguments, which
+    awaits the approval without blocking the event loop.
 """
 
 from .constants import DEFAULT_REFUSAL_VALUE, ApprovalStatus
-from .decorator import approval_gate
-
-__all__ = ['approval_gate', 'DEFAULT_REFUSAL_VALUE', 'ApprovalStatus']
+from .decorator import approval_gate, approval_gate_async, check_approval
+from .logging_utils import disable_background_logging, enable_background_logging
+
+__all__ = [
+    'approval_gate',
+    'approval_gate_async',
+    'check_approval',
+    'enable_background_logging',
+    'disable_background_logging',
+    'DEFAULT_REFUSAL_VALUE',
+    'ApprovalStatus'
+]
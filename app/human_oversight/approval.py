@@ -8,50 +8,201 @@ This module contains functions for creating approval payloads,
 sending approval requests, and processing approval responses.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import HO_LOGIC_APP_URL
-from .constants import ApprovalStatus, TIMEOUT_SECONDS
+from .constants import (APPROVAL_CACHE_MAX_ENTRIES, HTTP_MAX_RETRIES, HTTP_POOL_CONNECTIONS,
+                        HTTP_POOL_MAXSIZE, HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_STATUS_CODES,
+                        TIMEOUT_SECONDS, ApprovalStatus)
 from .logging_utils import get_current_timestamp, log_approval_event
 from .types import ApprovalPayload, ApprovalResponse, LogEvent, Parameters
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Plain string status values, bound once for comparisons and log events
+_APPROVED = ApprovalStatus.APPROVED.value
+_REJECTED = ApprovalStatus.REJECTED.value
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session with a keep-alive connection pool for the Logic App.
+    
+    Reusing one session across approval requests avoids a new TCP and TLS
+    handshake for every call. Retries use urllib3's default allowed methods,
+    so a POST is only retried when the connection could not be established
+    and a duplicate approval email can never be triggered.
+    
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_CODES
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session so consecutive approval requests reuse the same connection
+_SESSION = create_session()
+
+# Headers of every approval request, built once instead of per call
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Scalar types that are always JSON serializable and need no probing; ints
+# (and bools) are only safe within the range orjson serializes
+_JSON_SAFE_TYPES = (str, float, type(None))
+_INT_MIN = -2**63
+_INT_MAX = 2**64 - 1
+
+# Start of the placeholder replacing values that cannot be serialized
+_UNSERIALIZABLE_PREFIX = "<unserializable: "
+
+# Granted approvals by cache key, with their expiry time on the monotonic clock, oldest first
+_APPROVAL_CACHE: OrderedDict[str, Tuple[float, ApprovalResponse]] = OrderedDict()
+_APPROVAL_CACHE_LOCK = threading.Lock()
+
+
+def _is_json_safe(value: Any) -> bool:
+    """Check whether a value is a scalar orjson serializes without probing."""
+    if isinstance(value, int):
+        return _INT_MIN <= value <= _INT_MAX
+    return isinstance(value, _JSON_SAFE_TYPES)
+
 
 def create_serializable_parameters(kwargs: Dict[str, Any]) -> Parameters:
     """
     Create a dictionary of serializable parameters from function arguments.
     
     Converts non-serializable objects to string representations to ensure
-    the parameters can be safely serialized to JSON.
+    the parameters can be safely serialized to JSON with orjson (dict keys that
+    are not strings are allowed and serialized as strings). Parameters
+    holding only scalar values are returned without serializing anything;
+    otherwise all values are probed with a single serialization, and values
+    are only probed one by one when that fails.
     
     Args:
-        kwargs: Function keyword arguments to be serialized
+        kwargs: Function arguments to be serialized, by parameter name
         
     Returns:
         Dictionary with serializable values
     """
-    parameters = {}
-    for name, value in kwargs.items():
+    parameters = dict(kwargs)
+    if all(_is_json_safe(value) for value in parameters.values()):
+        return parameters
+
+    # orjson.JSONEncodeError is the only way a probe fails; anything else is a bug
+    try:
+        orjson.dumps(parameters, option=orjson.OPT_NON_STR_KEYS)
+        return parameters
+    except orjson.JSONEncodeError:
+        pass
+
+    for name, value in parameters.items():
+        if _is_json_safe(value):
+            continue
         try:
-            json.dumps({name: value})
-            parameters[name] = value
-        except (TypeError, OverflowError, ValueError):
-            parameters[name] = f"<unserializable: {type(value).__name__}>"
+            orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            parameters[name] = f"{_UNSERIALIZABLE_PREFIX}{type(value).__name__}>"
     return parameters
 
 
+def has_unserializable_parameters(parameters: Parameters) -> bool:
+    """
+    Check whether create_serializable_parameters had to mask any value.
+    
+    Masked values only name their type, so they do not identify the argument.
+    
+    Args:
+        parameters: Parameters returned by create_serializable_parameters
+        
+    Returns:
+        Boolean indicating if any parameter is an unserializable placeholder
+    """
+    return any(
+        isinstance(value, str) and value.startswith(_UNSERIALIZABLE_PREFIX)
+        for value in parameters.values()
+    )
+
+
+def create_payload_template(
+    agent_name: str,
+    action_description: str,
+    approver_emails: List[str]
+) -> ApprovalPayload:
+    """
+    Create the part of an approval payload that is fixed for a gated function.
+    
+    Args:
+        agent_name: Name of the agent requesting approval
+        action_description: Description of the action requiring approval
+        approver_emails: List of email addresses for approvers
+        
+    Returns:
+        Payload template to complete with fill_approval_payload
+    """
+    return {
+        "agentName": agent_name,
+        "actionDescription": action_description,
+        "approverEmails": list(approver_emails)
+    }
+
+
+def fill_approval_payload(
+    template: ApprovalPayload,
+    parameters: Parameters,
+    correlation_id: str,
+    timestamp: Optional[str] = None
+) -> ApprovalPayload:
+    """
+    Create the payload for an approval request from a payload template.
+    
+    Args:
+        template: Template created by create_payload_template (not modified)
+        parameters: Parameters for the action (must be serializable)
+        correlation_id: Unique ID for tracking this approval request
+        timestamp: Timestamp of the request, defaults to the current time
+        
+    Returns:
+        Dictionary containing the structured payload for the approval request
+    """
+    payload = template.copy()
+    # Each payload gets its own list, so changing one does not change the template
+    payload["approverEmails"] = list(template["approverEmails"])
+    payload["parameters"] = parameters
+    payload["correlationId"] = correlation_id
+    payload["timestamp"] = timestamp or get_current_timestamp()
+    return payload
+
+
 def create_approval_payload(
     agent_name: str,
     action_description: str,
     parameters: Parameters,
     approver_emails: List[str],
-    correlation_id: str
+    correlation_id: str,
+    timestamp: Optional[str] = None
 ) -> ApprovalPayload:
     """
     Create the payload for an approval request.
@@ -62,21 +213,16 @@ def create_approval_payload(
         parameters: Parameters for the action (must be serializable)
         approver_emails: List of email addresses for approvers
         correlation_id: Unique ID for tracking this approval request
+        timestamp: Timestamp of the request, defaults to the current time
         
     Returns:
         Dictionary containing the structured payload for the approval request
     """
-    return {
-        "agentName": agent_name,
-        "actionDescription": action_description,
-        "parameters": parameters,
-        "approverEmails": approver_emails,
-        "correlationId": correlation_id,
-        "timestamp": get_current_timestamp()
-    }
+    template = create_payload_template(agent_name, action_description, approver_emails)
+    return fill_approval_payload(template, parameters, correlation_id, timestamp)
 
 
-def send_approval_request(payload: ApprovalPayload) -> Tuple[bool, Optional[ApprovalResponse]]:
+def send_approval_request(payload: ApprovalPayload) -> Tuple[ApprovalStatus, Optional[ApprovalResponse]]:
     """
     Send an approval request to the Logic App endpoint.
     
@@ -85,30 +231,44 @@ def send_approval_request(payload: ApprovalPayload) -> Tuple[bool, Optional[Appr
         
     Returns:
         Tuple containing:
-        - Boolean indicating success or failure of the HTTP request
-        - Response data if successful, None otherwise
+        - ApprovalStatus.RECEIVED if the Logic App answered, ApprovalStatus.TIMEOUT
+          if the request timed out, ApprovalStatus.ERROR for any other failure
+        - Response data if received, None otherwise
     """
     try:
-        response = requests.post(
+        response = _SESSION.post(
             HO_LOGIC_APP_URL,
-            json=payload,
+            data=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+            headers=_JSON_HEADERS,
             timeout=TIMEOUT_SECONDS
         )
         response.raise_for_status()
-        return True, response.json()
+        response_data = orjson.loads(response.content)
+        if not isinstance(response_data, dict):
+            logger.error("Unexpected response from Logic App (ID: %s): not a JSON object.", payload['correlationId'])
+            return ApprovalStatus.ERROR, None
+        return ApprovalStatus.RECEIVED, response_data
 
     except requests.exceptions.Timeout:
         logger.error("Request to Logic App timed out (ID: %s).", payload['correlationId'])
-        return False, None
+        return ApprovalStatus.TIMEOUT, None
 
     except requests.exceptions.RequestException as exception:
         logger.error("Error calling Logic App (ID: %s): %s", payload['correlationId'], exception)
-        return False, None
+        return ApprovalStatus.ERROR, None
+
+    except orjson.JSONDecodeError as exception:
+        logger.error("Invalid JSON response from Logic App (ID: %s): %s", payload['correlationId'], exception)
+        return ApprovalStatus.ERROR, None
+
+    except orjson.JSONEncodeError as exception:
+        logger.error("Could not serialize approval request (ID: %s): %s", payload['correlationId'], exception)
+        return ApprovalStatus.ERROR, None
 
 
 def update_log_with_response(
     log_event: LogEvent,
-    success: bool,
+    request_status: ApprovalStatus,
     response_data: Optional[ApprovalResponse]
 ) -> LogEvent:
     """
@@ -116,32 +276,26 @@ def update_log_with_response(
     
     Args:
         log_event: Current log event to update
-        success: Whether the HTTP request was successful
+        request_status: Outcome of the HTTP request, as returned by send_approval_request
         response_data: Response data from the approval request
         
     Returns:
         Updated log event dictionary
     """
-    if not success:
-        status = ApprovalStatus.TIMEOUT.value if isinstance(success, requests.exceptions.Timeout) else ApprovalStatus.ERROR.value
-        log_event.update({
-            "Status": status,
-            "CompletionTimestamp": get_current_timestamp()
-        })
-        if not isinstance(success, requests.exceptions.Timeout):
+    completion_timestamp = get_current_timestamp()
+
+    if request_status is not ApprovalStatus.RECEIVED:
+        log_event["Status"] = request_status.value
+        log_event["CompletionTimestamp"] = completion_timestamp
+        if request_status is ApprovalStatus.ERROR:
             log_event["Error"] = "HTTP request failed"
         return log_event
 
     # Request succeeded and we have response data
     if response_data:
-        approval_status = response_data.get("status")
-        approver = response_data.get("approver", "Unknown")
-
-        log_event.update({
-            "Status": approval_status,
-            "Approver": approver,
-            "CompletionTimestamp": get_current_timestamp()
-        })
+        log_event["Status"] = response_data.get("status")
+        log_event["Approver"] = response_data.get("approver", "Unknown")
+        log_event["CompletionTimestamp"] = completion_timestamp
 
     return log_event
 
@@ -161,18 +315,146 @@ def request_approval(
         
     Returns:
         Tuple containing:
-        - Boolean indicating success or failure
-        - Response data if successful, None otherwise
+        - Boolean indicating whether the Logic App answered the request
+        - Response data if received, None otherwise
+        - Updated log event
+    """
+    logger.info("Requesting approval (ID: %s)...", correlation_id)
+
+    request_status, response_data = send_approval_request(payload)
+
+    updated_log = update_log_with_response(log_event, request_status, response_data)
+    log_approval_event(updated_log)
+
+    return request_status is ApprovalStatus.RECEIVED, response_data, updated_log
+
+
+async def send_approval_request_async(payload: ApprovalPayload) -> Tuple[ApprovalStatus, Optional[ApprovalResponse]]:
+    """
+    Send an approval request to the Logic App endpoint without blocking the event loop.
+    
+    The request runs in a worker thread and goes through the same pooled
+    session as `send_approval_request`.
+    
+    Args:
+        payload: Payload for the approval request
+        
+    Returns:
+        Tuple containing:
+        - Outcome of the HTTP request (see send_approval_request)
+        - Response data if received, None otherwise
+    """
+    return await asyncio.to_thread(send_approval_request, payload)
+
+
+async def request_approval_async(
+    payload: ApprovalPayload,
+    log_event: LogEvent,
+    correlation_id: str
+) -> Tuple[bool, Optional[ApprovalResponse], LogEvent]:
+    """
+    Send an approval request asynchronously and handle the response logging.
+    
+    Args:
+        payload: Payload for the approval request
+        log_event: Current log event to update
+        correlation_id: Unique ID for this approval request
+        
+    Returns:
+        Tuple containing:
+        - Boolean indicating whether the Logic App answered the request
+        - Response data if received, None otherwise
         - Updated log event
     """
     logger.info("Requesting approval (ID: %s)...", correlation_id)
 
-    success, response_data = send_approval_request(payload)
+    request_status, response_data = await send_approval_request_async(payload)
 
-    updated_log = update_log_with_response(log_event, success, response_data)
+    updated_log = update_log_with_response(log_event, request_status, response_data)
     log_approval_event(updated_log)
 
-    return success, response_data, updated_log
+    return request_status is ApprovalStatus.RECEIVED, response_data, updated_log
+
+
+def create_approval_cache_key(
+    agent_name: str,
+    action_description: str,
+    approver_emails: List[str],
+    parameters: Parameters
+) -> str:
+    """
+    Create the key identifying identical approval requests in the approval cache.
+    
+    Parameters with masked values (see has_unserializable_parameters) must not
+    be cached: different arguments of the same type get the same key.
+    
+    Args:
+        agent_name: Name of the agent requesting approval
+        action_description: Description of the action requiring approval
+        approver_emails: List of email addresses for approvers
+        parameters: Parameters for the action
+        
+    Returns:
+        Hex digest of the request identity
+    """
+    request_identity = orjson.dumps(
+        [agent_name, action_description, list(approver_emails), parameters],
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(request_identity, digest_size=16).hexdigest()
+
+
+def get_cached_approval(cache_key: str) -> Optional[ApprovalResponse]:
+    """
+    Get a previously granted approval that has not expired yet.
+    
+    Args:
+        cache_key: Key created by create_approval_cache_key
+        
+    Returns:
+        Cached response data, or None if there is no valid cached approval
+    """
+    with _APPROVAL_CACHE_LOCK:
+        entry = _APPROVAL_CACHE.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, response_data = entry
+        if time.monotonic() >= expires_at:
+            _APPROVAL_CACHE.pop(cache_key, None)
+            return None
+    return response_data
+
+
+def cache_approval(cache_key: str, response_data: ApprovalResponse, cache_ttl: float) -> None:
+    """
+    Remember a granted approval so identical requests can reuse it.
+    
+    Expired approvals are dropped first, and the oldest approval is evicted
+    when the cache holds APPROVAL_CACHE_MAX_ENTRIES of them, so varied
+    parameters cannot grow the cache without bound.
+    
+    Args:
+        cache_key: Key created by create_approval_cache_key
+        response_data: Response data of the granted approval
+        cache_ttl: Number of seconds the approval can be reused
+    """
+    now = time.monotonic()
+    with _APPROVAL_CACHE_LOCK:
+        expired = [key for key, (expires_at, _) in _APPROVAL_CACHE.items() if now >= expires_at]
+        for key in expired:
+            del _APPROVAL_CACHE[key]
+        _APPROVAL_CACHE.pop(cache_key, None)
+        if len(_APPROVAL_CACHE) >= APPROVAL_CACHE_MAX_ENTRIES:
+            # Evict the oldest approval
+            _APPROVAL_CACHE.popitem(last=False)
+        _APPROVAL_CACHE[cache_key] = (now + cache_ttl, response_data)
+
+
+def clear_approval_cache() -> None:
+    """Forget all cached approvals."""
+    with _APPROVAL_CACHE_LOCK:
+        _APPROVAL_CACHE.clear()
 
 
 def is_approval_granted(response_data: ApprovalResponse) -> bool:
@@ -185,7 +467,7 @@ def is_approval_granted(response_data: ApprovalResponse) -> bool:
     Returns:
         Boolean indicating if approval was granted
     """
-    return response_data.get("status") == ApprovalStatus.APPROVED.value
+    return response_data.get("status") == _APPROVED
 
 
 def format_approval_result_message(
@@ -205,10 +487,10 @@ def format_approval_result_message(
     approval_status = response_data.get("status")
     approver = response_data.get("approver", "Unknown")
 
-    if approval_status == ApprovalStatus.APPROVED.value:
+    if approval_status == _APPROVED:
         return f"Approval received (ID: {correlation_id}) from {approver}."
 
-    status_message = "rejected" if approval_status == ApprovalStatus.REJECTED.value else "timed out or status unclear"
-    approver_info = f" by {approver}" if approval_status == ApprovalStatus.REJECTED.value else f". Status: {approval_status}"
+    status_message = "rejected" if approval_status == _REJECTED else "timed out or status unclear"
+    approver_info = f" by {approver}" if approval_status == _REJECTED else f". Status: {approval_status}"
 
     return f"Approval {status_message} (ID: {correlation_id}){approver_info}"
@@ -19,7 +19,10 @@ load_dotenv()
 
 HO_LOGIC_APP_URL: Optional[str] = os.getenv("HO_LOGIC_APP_URL")
 
-if not HO_LOGIC_APP_URL:
+# Checked when approval gates are created, evaluated once at import
+HO_LOGIC_APP_CONFIGURED: bool = bool(HO_LOGIC_APP_URL)
+
+if not HO_LOGIC_APP_CONFIGURED:
     logger.warning(
         "HO_LOGIC_APP_URL environment variable not set. "
         "Human Oversight Approval Gate cannot be called. "
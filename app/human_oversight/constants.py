@@ -7,9 +7,18 @@ from enum import Enum
 
 # Request configuration
 TIMEOUT_SECONDS = 120  # HTTP request timeout in seconds
+HTTP_POOL_CONNECTIONS = 10  # Number of host connection pools kept by the HTTP session
+HTTP_POOL_MAXSIZE = 20  # Maximum number of keep-alive connections per host
+HTTP_MAX_RETRIES = 2  # Retries for connection errors and retryable gateway responses
+HTTP_RETRY_BACKOFF_FACTOR = 0.2  # Backoff factor between retries in seconds
+HTTP_RETRY_STATUS_CODES = (502, 503, 504)  # Gateway responses worth retrying
 
 # Default values
 DEFAULT_REFUSAL_VALUE = "Approval denied or timed out via Human Oversight Approval Gate."
+DEFAULT_CACHE_TTL_SECONDS = 300  # How long a cached approval can be reused
+APPROVAL_CACHE_MAX_ENTRIES = 1024  # Maximum number of cached approvals
+DEFERRED_APPROVAL_MAX_WORKERS = 8  # Maximum number of deferred gated calls waiting at the same time
+DEFERRED_RESULT_TTL_SECONDS = 3600  # How long a finished deferred call's result waits for check_approval
 
 
 class ApprovalStatus(str, Enum):
@@ -20,6 +29,8 @@ class ApprovalStatus(str, Enum):
     """
     # Approval process statuses
     INITIATED = "Initiated"
+    PENDING = "Pending"  # A deferred gated call is waiting for its approval
+    RECEIVED = "Received"  # The Logic App answered the request with a decision
     APPROVED = "Approved"
     REJECTED = "Rejected"
     TIMEOUT = "Timeout"
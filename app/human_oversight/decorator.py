@@ -4,28 +4,52 @@
 """
 Decorator for creating approval gates on sensitive operations.
 
-This module provides a decorator that wraps functions requiring human approval
-before execution, implementing a approval workflow.
+This module provides decorators that wrap functions requiring human approval
+before execution, implementing a approval workflow. `approval_gate` wraps regular
+functions and `approval_gate_async` wraps coroutine functions so several
+approvals can be awaited concurrently.
 """
 
 import functools
 import inspect
 import logging
-import uuid
-from typing import Any, Callable, List, Optional, cast
-
-from .approval import (create_approval_payload,
-                              create_serializable_parameters,
-                              format_approval_result_message, is_approval_granted,
-                              request_approval)
-from .config import HO_LOGIC_APP_URL
-from .constants import ApprovalStatus, DEFAULT_REFUSAL_VALUE
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from .approval import (cache_approval, create_approval_cache_key, create_payload_template,
+                              create_serializable_parameters, fill_approval_payload,
+                              format_approval_result_message, get_cached_approval,
+                              has_unserializable_parameters, is_approval_granted,
+                              request_approval, request_approval_async, update_log_with_response)
+from .config import HO_LOGIC_APP_CONFIGURED
+from .constants import (ApprovalStatus, DEFAULT_CACHE_TTL_SECONDS, DEFAULT_REFUSAL_VALUE,
+                        DEFERRED_APPROVAL_MAX_WORKERS, DEFERRED_RESULT_TTL_SECONDS)
 from .logging_utils import create_initial_log_event, get_current_timestamp, log_approval_event
-from .types import ApprovalResponse, F, LogEvent
+from .types import ApprovalPayload, ApprovalResponse, F, LogEvent, Parameters
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Plain string status values, bound once for log events
+_EXECUTED = ApprovalStatus.EXECUTED.value
+_EXECUTION_FAILED = ApprovalStatus.EXECUTION_FAILED.value
+_PENDING = ApprovalStatus.PENDING.value
+
+# Gated calls deferred with approval_gate(defer_approval=True), by correlation ID
+_DEFERRED_CALLS: Dict[str, Future] = {}
+# Finish time (monotonic clock) of deferred calls whose result was not collected
+# yet, oldest first; they are forgotten after DEFERRED_RESULT_TTL_SECONDS
+_FINISHED_DEFERRED_CALLS: "OrderedDict[str, float]" = OrderedDict()
+_DEFERRED_CALLS_LOCK = threading.Lock()
+_DEFERRED_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DEFERRED_APPROVAL_MAX_WORKERS,
+    thread_name_prefix="approval-gate"
+)
+
 
 def validate_configuration() -> None:
     """
@@ -34,13 +58,47 @@ def validate_configuration() -> None:
     Raises:
         ValueError: If required environment variables are not set
     """
-    if not HO_LOGIC_APP_URL:
+    if not HO_LOGIC_APP_CONFIGURED:
         raise ValueError(
             "HO_LOGIC_APP_URL environment variable must be set to use the approval_gate decorator. "
             "Set this variable to the URL of your approval Logic App."
         )
 
 
+def log_execution_success(log_event: LogEvent) -> None:
+    """
+    Record a successful execution of an approved function.
+    
+    Args:
+        log_event: Current log event to update
+    """
+    log_event["Status"] = _EXECUTED
+    log_event["ExecutionTimestamp"] = get_current_timestamp()
+    log_approval_event(log_event)
+
+
+def log_execution_failure(log_event: LogEvent, exception: Exception, correlation_id: str) -> None:
+    """
+    Record a failed execution of an approved function.
+    
+    Args:
+        log_event: Current log event to update
+        exception: Exception raised by the function
+        correlation_id: Unique ID for this approval
+    """
+    # The traceback is only rendered if the record is emitted
+    logger.error(
+        "Error during function execution after approval (ID: %s): %s",
+        correlation_id,
+        exception,
+        exc_info=exception
+    )
+    log_event["Status"] = _EXECUTION_FAILED
+    log_event["Error"] = str(exception)
+    log_event["ExecutionTimestamp"] = get_current_timestamp()
+    log_approval_event(log_event)
+
+
 def execute_function_with_logging(
     func: Callable,
     args: Any,
@@ -66,25 +124,142 @@ def execute_function_with_logging(
     """
     try:
         result = func(*args, **kwargs)
+    except Exception as exception:
+        log_execution_failure(log_event, exception, correlation_id)
+        raise
 
-        log_event.update({
-            "Status": ApprovalStatus.EXECUTED.value,
-            "ExecutionTimestamp": get_current_timestamp()
-        })
-        log_approval_event(log_event)
+    log_execution_success(log_event)
+    return result
 
-        return result
 
+async def execute_coroutine_with_logging(
+    func: Callable,
+    args: Any,
+    kwargs: Any,
+    log_event: LogEvent,
+    correlation_id: str
+) -> Any:
+    """
+    Await the coroutine function and log the result.
+    
+    Args:
+        func: Coroutine function to execute
+        args: Positional arguments
+        kwargs: Keyword arguments
+        log_event: Current log event to update
+        correlation_id: Unique ID for this approval
+        
+    Returns:
+        Result of the coroutine
+        
+    Raises:
+        Exception: Any exception raised by the coroutine
+    """
+    try:
+        result = await func(*args, **kwargs)
     except Exception as exception:
-        logger.error("Error during function execution after approval (ID: %s): %s", correlation_id, exception)
-        log_event.update({
-            "Status": ApprovalStatus.EXECUTION_FAILED.value,
-            "Error": str(exception),
-            "ExecutionTimestamp": get_current_timestamp()
-        })
-        log_approval_event(log_event)
+        log_execution_failure(log_event, exception, correlation_id)
         raise
 
+    log_execution_success(log_event)
+    return result
+
+
+def should_execute(response_data: Optional[ApprovalResponse], correlation_id: str) -> bool:
+    """
+    Decide whether the gated function may run and log the approval result.
+    
+    Args:
+        response_data: Response from the approval request
+        correlation_id: Unique ID for this approval
+        
+    Returns:
+        Boolean indicating if the function should be executed
+    """
+    if not response_data:
+        return False
+
+    message = format_approval_result_message(response_data, correlation_id)
+    if is_approval_granted(response_data):
+        logger.info("%s Executing function...", message)
+        return True
+    logger.warning(message)
+    return False
+
+
+def create_request_cache_key(
+    cacheable: bool,
+    agent_name: str,
+    action_description: str,
+    approver_emails: List[str],
+    parameters: Parameters
+) -> Optional[str]:
+    """
+    Create the approval cache key of a gated call, if its approval may be cached.
+    
+    Calls with masked unserializable parameters are never cached: arguments of
+    the same type would share a key, and an approval for one object would be
+    reused for another.
+    
+    Args:
+        cacheable: Whether the gate was created with cacheable=True
+        agent_name: Name of the agent requesting approval
+        action_description: Description of the action requiring approval
+        approver_emails: List of email addresses for approvers
+        parameters: Serializable parameters of the call
+        
+    Returns:
+        Approval cache key, or None if the approval must not be cached
+    """
+    if not cacheable or has_unserializable_parameters(parameters):
+        return None
+    return create_approval_cache_key(agent_name, action_description, approver_emails, parameters)
+
+
+def lookup_cached_approval(
+    cache_key: Optional[str],
+    log_event: LogEvent,
+    correlation_id: str
+) -> Optional[ApprovalResponse]:
+    """
+    Look up a cached approval for the request and log its reuse.
+    
+    Args:
+        cache_key: Approval cache key, or None if the gate is not cacheable
+        log_event: Current log event to update
+        correlation_id: Unique ID for this approval
+        
+    Returns:
+        Cached response data, or None if the Logic App has to be called
+    """
+    if cache_key is None:
+        return None
+
+    response_data = get_cached_approval(cache_key)
+    if response_data:
+        logger.info("Reusing cached approval (ID: %s)...", correlation_id)
+        update_log_with_response(log_event, ApprovalStatus.RECEIVED, response_data)
+        log_event["CachedApproval"] = True
+        log_approval_event(log_event)
+    return response_data
+
+
+def remember_approval(
+    cache_key: Optional[str],
+    response_data: Optional[ApprovalResponse],
+    cache_ttl: float
+) -> None:
+    """
+    Cache the response if the gate is cacheable and approval was granted.
+    
+    Args:
+        cache_key: Approval cache key, or None if the gate is not cacheable
+        response_data: Response from the approval request
+        cache_ttl: Number of seconds the approval can be reused
+    """
+    if cache_key is not None and response_data and is_approval_granted(response_data):
+        cache_approval(cache_key, response_data, cache_ttl)
+
 
 def handle_approval_response(
     response_data: Optional[ApprovalResponse],
@@ -110,23 +285,184 @@ def handle_approval_response(
     Returns:
         Result of function execution if approved, or refusal value
     """
-    if not response_data:
-        return refusal_return_value
-
-    if is_approval_granted(response_data):
-        message = format_approval_result_message(response_data, correlation_id)
-        logger.info("%s Executing function...", message)
+    if should_execute(response_data, correlation_id):
         return execute_function_with_logging(func, args, kwargs, log_event, correlation_id)
-    message = format_approval_result_message(response_data, correlation_id)
-    logger.warning(message)
     return refusal_return_value
 
 
+def _record_finished_call(handle: str) -> None:
+    """Remember when a deferred call finished, so its result can expire."""
+    with _DEFERRED_CALLS_LOCK:
+        if handle in _DEFERRED_CALLS:
+            _FINISHED_DEFERRED_CALLS[handle] = time.monotonic()
+
+
+def _forget_expired_calls() -> None:
+    """Drop finished deferred calls whose result was not collected in time."""
+    expired_before = time.monotonic() - DEFERRED_RESULT_TTL_SECONDS
+    with _DEFERRED_CALLS_LOCK:
+        while _FINISHED_DEFERRED_CALLS:
+            handle, finished_at = next(iter(_FINISHED_DEFERRED_CALLS.items()))
+            if finished_at > expired_before:
+                break
+            del _FINISHED_DEFERRED_CALLS[handle]
+            _DEFERRED_CALLS.pop(handle, None)
+
+
+def defer_gated_call(correlation_id: str, gated_call: Callable, *call_args: Any) -> Dict[str, str]:
+    """
+    Run a gated call in the background and return a handle to check on it.
+    
+    Args:
+        correlation_id: Unique ID for this approval, used as the handle
+        gated_call: Function requesting the approval and executing the gated function
+        call_args: Arguments for `gated_call`
+        
+    Returns:
+        Dictionary with the Pending status and the handle for check_approval
+    """
+    _forget_expired_calls()
+    future = _DEFERRED_EXECUTOR.submit(gated_call, *call_args)
+    with _DEFERRED_CALLS_LOCK:
+        _DEFERRED_CALLS[correlation_id] = future
+    future.add_done_callback(lambda _: _record_finished_call(correlation_id))
+    return {"status": _PENDING, "handle": correlation_id}
+
+
+def check_approval(handle: str) -> Tuple[bool, Any]:
+    """
+    Check on a gated call deferred with `approval_gate(..., defer_approval=True)`.
+    
+    A finished call is forgotten once its result has been returned, or when
+    its result was not asked for within DEFERRED_RESULT_TTL_SECONDS of the
+    call finishing, so unchecked handles do not keep results alive forever.
+    
+    Args:
+        handle: Handle returned by the deferred gated call
+        
+    Returns:
+        Tuple containing:
+        - Boolean indicating whether the gated call has finished
+        - Result of the function, or the refusal value if approval was not
+          granted; None while the call is pending
+        
+    Raises:
+        KeyError: If the handle is unknown, expired or its result was already returned
+        Exception: Any exception raised by the gated function
+    """
+    _forget_expired_calls()
+    with _DEFERRED_CALLS_LOCK:
+        future = _DEFERRED_CALLS[handle]
+        if not future.done():
+            return False, None
+
+        del _DEFERRED_CALLS[handle]
+        _FINISHED_DEFERRED_CALLS.pop(handle, None)
+    return True, future.result()
+
+
+def create_parameter_binder(func: Callable) -> Callable[[Any, Any], Parameters]:
+    """
+    Create a function mapping a call's args and kwargs to named parameters.
+    
+    The signature of `func` is inspected once and a binder specialized for it
+    is returned: without *args, positional values only need to be zipped with
+    their parameter names; with *args, the extra positional values are also
+    keyed by their index (arg<i>). Positional and keyword values are made
+    serializable together, in a single pass.
+    
+    Args:
+        func: Function being gated
+        
+    Returns:
+        Function taking a call's args and kwargs and returning its parameters
+    """
+    signature_params = inspect.signature(func).parameters.values()
+    param_names = tuple(
+        param.name for param in signature_params
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+    )
+
+    if not any(param.kind is param.VAR_POSITIONAL for param in signature_params):
+        def bind_parameters(args: Any, kwargs: Any) -> Parameters:
+            parameters = dict(zip(param_names, args))
+            if kwargs:
+                parameters.update(kwargs)
+            return create_serializable_parameters(parameters)
+
+        return bind_parameters
+
+    param_count = len(param_names)
+
+    def bind_var_positional_parameters(args: Any, kwargs: Any) -> Parameters:
+        parameters = dict(zip(param_names, args))
+        for i in range(param_count, len(args)):
+            parameters[f"arg{i}"] = args[i]
+        if kwargs:
+            parameters.update(kwargs)
+        return create_serializable_parameters(parameters)
+
+    return bind_var_positional_parameters
+
+
+def create_request_builder(
+    func: Callable,
+    agent_name: str,
+    action_description: str,
+    approver_emails: List[str]
+) -> Callable[[Any, Any], Tuple[str, ApprovalPayload, LogEvent]]:
+    """
+    Create the function that turns a call of `func` into an approval request.
+    
+    The parameter binder for `func` and the fixed part of the approval payload
+    are built once here instead of on every call.
+    
+    Args:
+        func: Function being gated
+        agent_name: Name of the agent requesting approval
+        action_description: Description of the action requiring approval
+        approver_emails: List of email addresses for approvers
+        
+    Returns:
+        Function taking the call's args and kwargs and returning the
+        correlation ID, approval payload and logged initial log event
+    """
+    bind_parameters = create_parameter_binder(func)
+    payload_template = create_payload_template(agent_name, action_description, approver_emails)
+
+    def build_request(args: Any, kwargs: Any) -> Tuple[str, ApprovalPayload, LogEvent]:
+        # Opaque 128-bit random ID, also used as the approval table's RowKey
+        correlation_id = secrets.token_hex(16)
+        parameters = bind_parameters(args, kwargs)
+
+        # The log event and the payload describe the same request and share
+        # the parameters dict; nothing downstream mutates it in place
+        timestamp = get_current_timestamp()
+
+        log_event = create_initial_log_event(
+            agent_name,
+            correlation_id,
+            action_description,
+            parameters,
+            timestamp
+        )
+        log_approval_event(log_event)
+
+        payload = fill_approval_payload(payload_template, parameters, correlation_id, timestamp)
+
+        return correlation_id, payload, log_event
+
+    return build_request
+
+
 def approval_gate(
     agent_name: str,
     action_description: str,
     approver_emails: List[str],
-    refusal_return_value: Any = DEFAULT_REFUSAL_VALUE
+    refusal_return_value: Any = DEFAULT_REFUSAL_VALUE,
+    cacheable: bool = False,
+    cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+    defer_approval: bool = False
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """
     Decorator that creates an approval gate for sensitive operations.
@@ -140,6 +476,15 @@ def approval_gate(
         action_description: Description of the action requiring approval
         approver_emails: List of email addresses for approvers
         refusal_return_value: Value to return if approval is denied or times out
+        cacheable: Whether a granted approval can be reused for identical calls
+            (same parameters) within `cache_ttl`. Leave disabled for destructive
+            or otherwise non-repeatable actions.
+        cache_ttl: Number of seconds a granted approval can be reused
+        defer_approval: Whether calls return immediately with a
+            {"status": "Pending", "handle": ...} dictionary while the approval
+            is awaited in the background; pass the handle to check_approval
+            to get the result. Results not collected within
+            DEFERRED_RESULT_TTL_SECONDS of the call finishing are discarded.
         
     Returns:
         Decorated function that will only execute after approval
@@ -150,49 +495,29 @@ def approval_gate(
     validate_configuration()
 
     def decorator(func: F) -> F:
-        @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            correlation_id = str(uuid.uuid4())
-
-            # Create a combined parameters dict that includes both positional and keyword args
-            parameters = {}
-
-            # Add positional args with arg index as key
-            sig = inspect.signature(func)
-            param_names = list(sig.parameters.keys())
-
-            # Map positional args to their parameter names
-            for i, arg in enumerate(args):
-                if i < len(param_names):
-                    arg_name = param_names[i]
-                    parameters[arg_name] = arg
-                else:
-                    parameters[f"arg{i}"] = arg
+        build_request = create_request_builder(func, agent_name, action_description, approver_emails)
 
-            # Add keyword args
-            parameters.update(create_serializable_parameters(kwargs))
-
-            log_event = create_initial_log_event(
-                agent_name,
-                correlation_id,
-                action_description,
-                parameters
+        def run_gated_call(
+            args: Any,
+            kwargs: Any,
+            correlation_id: str,
+            payload: ApprovalPayload,
+            log_event: LogEvent
+        ) -> Any:
+            cache_key = create_request_cache_key(
+                cacheable, agent_name, action_description, approver_emails, payload["parameters"]
             )
-            log_approval_event(log_event)
 
-            payload = create_approval_payload(
-                agent_name,
-                action_description,
-                parameters,
-                approver_emails,
-                correlation_id
-            )
+            response_data = lookup_cached_approval(cache_key, log_event, correlation_id)
+            if response_data:
+                return execute_function_with_logging(func, args, kwargs, log_event, correlation_id)
 
             success, response_data, log_event = request_approval(
                 payload,
                 log_event,
                 correlation_id
             )
+            remember_approval(cache_key, response_data, cache_ttl)
 
             if not success:
                 return refusal_return_value
@@ -207,5 +532,85 @@ def approval_gate(
                 refusal_return_value
             )
 
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            correlation_id, payload, log_event = build_request(args, kwargs)
+
+            if defer_approval:
+                return defer_gated_call(correlation_id, run_gated_call, args, kwargs, correlation_id, payload, log_event)
+
+            return run_gated_call(args, kwargs, correlation_id, payload, log_event)
+
+        return cast(F, wrapper)
+    return decorator
+
+
+def approval_gate_async(
+    agent_name: str,
+    action_description: str,
+    approver_emails: List[str],
+    refusal_return_value: Any = DEFAULT_REFUSAL_VALUE,
+    cacheable: bool = False,
+    cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that creates an approval gate for sensitive coroutine functions.
+    
+    Works like `approval_gate`, but the approval request is awaited without
+    blocking the event loop, so multiple gated actions can wait for their
+    approvals concurrently (e.g. with asyncio.gather).
+    
+    Args:
+        agent_name: Name of the agent requesting approval
+        action_description: Description of the action requiring approval
+        approver_emails: List of email addresses for approvers
+        refusal_return_value: Value to return if approval is denied or times out
+        cacheable: Whether a granted approval can be reused for identical calls
+            (same parameters) within `cache_ttl`. Leave disabled for destructive
+            or otherwise non-repeatable actions.
+        cache_ttl: Number of seconds a granted approval can be reused
+        
+    Returns:
+        Decorated coroutine function that will only execute after approval
+        
+    Raises:
+        ValueError: If HO_LOGIC_APP_URL environment variable is not set
+        TypeError: If the decorated function is not a coroutine function
+    """
+    validate_configuration()
+
+    def decorator(func: F) -> F:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(
+                f"approval_gate_async can only decorate coroutine functions, got {func!r}. "
+                "Use approval_gate for regular functions."
+            )
+
+        build_request = create_request_builder(func, agent_name, action_description, approver_emails)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            correlation_id, payload, log_event = build_request(args, kwargs)
+
+            cache_key = create_request_cache_key(
+                cacheable, agent_name, action_description, approver_emails, payload["parameters"]
+            )
+
+            response_data = lookup_cached_approval(cache_key, log_event, correlation_id)
+            if response_data:
+                return await execute_coroutine_with_logging(func, args, kwargs, log_event, correlation_id)
+
+            success, response_data, log_event = await request_approval_async(
+                payload,
+                log_event,
+                correlation_id
+            )
+            remember_approval(cache_key, response_data, cache_ttl)
+
+            if not success or not should_execute(response_data, correlation_id):
+                return refusal_return_value
+
+            return await execute_coroutine_with_logging(func, args, kwargs, log_event, correlation_id)
+
         return cast(F, wrapper)
     return decorator
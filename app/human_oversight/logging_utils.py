@@ -3,36 +3,53 @@
 
 """Logging utilities for the human oversight module."""
 
-import json
+import atexit
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import orjson
 
 from .types import LogEvent
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Package logger that all human oversight module loggers propagate to
+package_logger = logging.getLogger(__package__)
+
+# Listener and handler installed by enable_background_logging
+_queue_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
 # Constants
 ISO_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+ISO_SECONDS_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
 
 def log_approval_event(event_data: LogEvent) -> None:
     """
     Log an approval event with standardized format.
     
+    The event is only serialized when the logger emits INFO records.
+    
     Args:
         event_data: Dictionary containing event information including agent name,
                    correlation ID, status, timestamps, and other relevant metadata.
     """
-    logger.info("Approval Event: %s", json.dumps(event_data))
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("Approval Event: %s", orjson.dumps(event_data, option=orjson.OPT_NON_STR_KEYS).decode())
 
 
 def create_initial_log_event(
     agent_name: str,
     correlation_id: str,
     action_description: str,
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any],
+    timestamp: Optional[str] = None
 ) -> LogEvent:
     """
     Create an initial log event for approval initiation.
@@ -42,6 +59,7 @@ def create_initial_log_event(
         correlation_id: Unique ID for tracking this approval request
         action_description: Human-readable description of the action requiring approval
         parameters: Parameters for the action that will be executed if approved
+        timestamp: Timestamp of the event, defaults to the current time
         
     Returns:
         Dictionary containing structured log event data with standardized fields
@@ -50,7 +68,7 @@ def create_initial_log_event(
         "PartitionKey": agent_name,
         "RowKey": correlation_id,
         "Status": "Initiated",
-        "Timestamp": get_current_timestamp(),
+        "Timestamp": timestamp or get_current_timestamp(),
         "ActionDescription": action_description,
         "Parameters": parameters
     }
@@ -60,7 +78,71 @@ def get_current_timestamp() -> str:
     """
     Get the current UTC timestamp in ISO format.
     
+    Formats the clock reading directly instead of building a datetime object.
+    
     Returns:
-        ISO 8601 formatted timestamp string in UTC timezone
+        ISO 8601 formatted timestamp string in UTC timezone (ISO_TIMESTAMP_FORMAT)
+    """
+    seconds, microseconds = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{time.strftime(ISO_SECONDS_FORMAT, time.gmtime(seconds))}.{microseconds:06d}Z"
+
+
+def enable_background_logging(*handlers: logging.Handler) -> None:
+    """
+    Emit human oversight log records from a background thread.
+    
+    Records of the human_oversight loggers are put on a queue and written by a
+    QueueListener, so approval calls no longer wait for slow handlers (e.g. a
+    stdout shipped to a log pipeline). Calling it again has no effect until
+    disable_background_logging is called.
+    
+    Args:
+        handlers: Handlers writing the records, defaults to the current
+                  handlers of the root logger
+    
+    Raises:
+        ValueError: If no handlers are given and the root logger has none,
+                    since the records, warnings and errors included, would be dropped
     """
-    return datetime.now(timezone.utc).isoformat()
+    global _queue_listener, _queue_handler  # pylint: disable=global-statement
+    if _queue_listener is not None:
+        return
+
+    handlers = handlers or tuple(logging.getLogger().handlers)
+    if not handlers:
+        raise ValueError(
+            "enable_background_logging needs handlers: pass them explicitly or configure "
+            "the root logger (e.g. with logging.basicConfig) before calling it."
+        )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_listener = QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True
+    )
+
+    package_logger.addHandler(_queue_handler)
+    package_logger.propagate = False
+    _queue_listener.start()
+    atexit.register(disable_background_logging)
+
+
+def disable_background_logging() -> None:
+    """
+    Stop emitting log records from a background thread.
+    
+    Pending records are written before returning, and records propagate to
+    the parent loggers again.
+    """
+    global _queue_listener, _queue_handler  # pylint: disable=global-statement
+    if _queue_listener is None:
+        return
+
+    package_logger.removeHandler(_queue_handler)
+    package_logger.propagate = True
+    _queue_listener.stop()
+    atexit.unregister(disable_background_logging)
+    _queue_listener = None
+    _queue_handler = None
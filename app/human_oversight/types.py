@@ -3,13 +3,42 @@
 
 """Type definitions for the human oversight module."""
 
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Callable, Dict, Sequence, TypedDict, TypeVar
 
 # Function type for the decorator
 F = TypeVar('F', bound=Callable[..., Any])
 
-# Type definitions for commonly used structures
-ApprovalPayload = Dict[str, Any]
-ApprovalResponse = Dict[str, str]
-LogEvent = Dict[str, Any]
+# Arguments of a gated call, by parameter name
 Parameters = Dict[str, Any]
+
+
+class ApprovalPayload(TypedDict, total=False):
+    """Body of the approval request sent to the Logic App."""
+    agentName: str
+    actionDescription: str
+    parameters: Parameters
+    approverEmails: Sequence[str]
+    correlationId: str
+    timestamp: str
+
+
+class ApprovalResponse(TypedDict, total=False):
+    """Body of the Logic App's answer to an approval request."""
+    correlationId: str
+    status: str
+    approver: str
+
+
+class LogEvent(TypedDict, total=False):
+    """Structured audit record of an approval, keyed like the approval table."""
+    PartitionKey: str
+    RowKey: str
+    Status: str
+    Timestamp: str
+    ActionDescription: str
+    Parameters: Parameters
+    Approver: str
+    CompletionTimestamp: str
+    ExecutionTimestamp: str
+    CachedApproval: bool
+    Error: str
@@ -5,10 +5,11 @@
 OpenAI client demo.
 """
 
-import json
+import asyncio
 import os
+from types import MappingProxyType
+import orjson
 from dotenv import load_dotenv
-from openai import AzureOpenAI
 from human_oversight import approval_gate
 
 load_dotenv()
@@ -17,17 +18,24 @@ APPROVER_EMAILS_STR = os.getenv("APPROVER_EMAILS")
 if not APPROVER_EMAILS_STR:
     raise ValueError("APPROVER_EMAILS environment variable must be set (comma-separated).")
 APPROVERS = [e.strip() for e in APPROVER_EMAILS_STR.split(',')]
+# Maximum number of tool calls of one assistant message that run at the same time
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "5"))
 
-try:
-    client = AzureOpenAI(
-        api_key = os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version = "2023-05-15",
-        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    )
-    print("Azure OpenAI client initialized.")
-except Exception as e:  #pylint: disable=broad-exception-caught
-    print(f"Warning: Failed to initialize OpenAI client: {e}. OpenAI calls will be skipped.")
-    client = None  #pylint: disable=invalid-name
+client = None  #pylint: disable=invalid-name
+if not os.getenv("AZURE_OPENAI_API_KEY"):
+    # The client cannot authenticate, so the openai package is not even imported
+    print("Warning: AZURE_OPENAI_API_KEY not set. OpenAI calls will be skipped.")
+else:
+    try:
+        from openai import AsyncAzureOpenAI  #pylint: disable=import-outside-toplevel
+        client = AsyncAzureOpenAI(
+            api_key = os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version = "2023-05-15",
+            azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+        )
+        print("Azure OpenAI client initialized.")
+    except Exception as e:  #pylint: disable=broad-exception-caught
+        print(f"Warning: Failed to initialize OpenAI client: {e}. OpenAI calls will be skipped.")
 
 USERS = {
     "1": {"id": "1", "name": "Alice", "email": "alice@example.com"},
@@ -35,6 +43,26 @@ USERS = {
     "3": {"id": "3", "name": "Charlie", "email": "charlie@fabrikam.com"}
 }
 
+def email_domain(user):
+    """
+    This method returns the domain of a user's email address.
+    """
+
+    return user["email"].rpartition("@")[2]
+
+def group_users_by_domain(users):
+    """
+    This method groups users by the domain of their email address.
+    """
+
+    users_by_domain = {}
+    for user in users.values():
+        users_by_domain.setdefault(email_domain(user), {})[user["id"]] = user
+    return users_by_domain
+
+# Users by email domain, so list_users does not scan every user for a filter
+USERS_BY_DOMAIN = group_users_by_domain(USERS)
+
 def list_users(location_filter=None):
     """
     This method lists users.
@@ -42,8 +70,8 @@ def list_users(location_filter=None):
 
     print(f"Executing list_users(location_filter='{location_filter}')...")
     if not location_filter:
-        return json.dumps(list(USERS.values()))
-    return json.dumps([u for u in USERS.values() if u["email"].endswith(f"@{location_filter}")])
+        return orjson.dumps(list(USERS.values())).decode()
+    return orjson.dumps(list(USERS_BY_DOMAIN.get(location_filter, {}).values())).decode()
 
 @approval_gate(
     agent_name=AGENT_NAME,
@@ -59,16 +87,18 @@ def delete_user(user_id):
     print(f"Executing delete_user(user_id='{user_id}')...")
     if user_id in USERS:
         user = USERS.pop(user_id)
+        USERS_BY_DOMAIN[email_domain(user)].pop(user_id)
         print(f"Successfully deleted user: {user['name']} (ID: {user_id})")
-        return json.dumps({
+        return orjson.dumps({
             "status": "success",
             "message": f"User {user_id} deleted.",
             "deleted_user": user
-        })
+        }).decode()
     print(f"User ID '{user_id}' not found.")
-    return json.dumps({"status": "error", "message": f"User {user_id} not found."})
+    return orjson.dumps({"status": "error", "message": f"User {user_id} not found."}).decode()
 
-tools = [
+# Tool schemas sent with every request, defined once for the module
+tools = (
     {
         "type": "function",
         "function": {
@@ -103,11 +133,71 @@ tools = [
             }
         }
     }
-]
+)
 
-funcs = {"list_users": list_users, "delete_user": delete_user}
+# Tool implementations by name, read-only like the tool schemas
+funcs = MappingProxyType({"list_users": list_users, "delete_user": delete_user})
 
-def run_conversation(prompt, msgs=None):
+async def call_tool(tool_call, semaphore):
+    """
+    This method runs one tool call in a worker thread.
+    """
+
+    function_name=tool_call["function"]["name"]
+    function=funcs.get(function_name)
+    if not function:
+        print(f"Error: Function '{function_name}' not found.")
+        return None
+    args=orjson.loads(tool_call["function"]["arguments"])
+    print(f"LLM wants to call: {function_name}({args})")
+    async with semaphore:
+        function_result=await asyncio.to_thread(function, **args)
+    print(f"Function response: {function_result}")
+    return function_result
+
+async def stream_response(msgs, semaphore):
+    """
+    This method streams a model response and starts each tool call as soon as it is complete.
+    """
+
+    stream=await client.chat.completions.create(model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME","gpt-4o"),messages=msgs,tools=tools,tool_choice="auto",stream=True)
+    content=[]
+    tool_calls=[]
+    # Argument fragments of each tool call, joined once the call is complete
+    argument_parts=[]
+    tasks=[]
+
+    def start_last_tool_call():
+        tool_calls[-1]["function"]["arguments"]="".join(argument_parts[-1])
+        tasks.append(asyncio.create_task(call_tool(tool_calls[-1], semaphore)))
+
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta=chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+            for tool_call_delta in delta.tool_calls or ():
+                if tool_call_delta.index==len(tool_calls):
+                    # Tool calls are streamed one after the other, so the previous one is complete
+                    if tool_calls:
+                        start_last_tool_call()
+                    tool_calls.append({"id":tool_call_delta.id,"type":"function","function":{"name":"","arguments":""}})
+                    argument_parts.append([])
+                if tool_call_delta.function and tool_call_delta.function.name:
+                    tool_calls[tool_call_delta.index]["function"]["name"]+=tool_call_delta.function.name
+                if tool_call_delta.function and tool_call_delta.function.arguments:
+                    argument_parts[tool_call_delta.index].append(tool_call_delta.function.arguments)
+        if tool_calls:
+            start_last_tool_call()
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return "".join(content) or None, tool_calls, tasks
+
+async def run_conversation(prompt, msgs=None):
     """
     This method runs a conversation.
     """
@@ -128,39 +218,44 @@ def run_conversation(prompt, msgs=None):
     msgs.append({"role":"user","content":prompt})
     print(f"\n--- Running conversation for prompt: '{prompt}' ---")
     try:
-        resp=client.chat.completions.create(model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME","gpt-4o"),messages=msgs,tools=tools,tool_choice="auto")
-        msg=resp.choices[0].message
-        tc=msg.tool_calls  #pylint: disable=invalid-name
-        if tc:
-            msgs.append(msg)
-            for c in tc:  #pylint: disable=invalid-name
-                function_name=c.function.name
-                function=funcs.get(function_name)
-                if not function:
-                    print(f"Error: Function '{function_name}' not found.")
+        # Tool calls wait for approvals independently, so run them concurrently
+        semaphore=asyncio.Semaphore(TOOL_CONCURRENCY_LIMIT)
+        content, tool_calls, tasks=await stream_response(msgs, semaphore)
+        if tool_calls:
+            msgs.append({"role":"assistant","content":content,"tool_calls":tool_calls})
+            results=await asyncio.gather(*tasks, return_exceptions=True)
+            for tool_call, function_result in zip(tool_calls, results):
+                if function_result is None:
                     continue
-                args=json.loads(c.function.arguments)
-                print(f"LLM wants to call: {function_name}({args})")
-                function_result=function(**args)
-                print(f"Function response: {function_result}")
-                msgs.append({"tool_call_id":c.id,"role":"tool","name":function_name,"content":function_result})
+                function_name=tool_call["function"]["name"]
+                if isinstance(function_result, Exception):
+                    print(f"Error calling {function_name}: {function_result}")
+                    function_result=f"Error: {function_result}"
+                msgs.append({"tool_call_id":tool_call["id"],"role":"tool","name":function_name,"content":function_result})
         else:
-            print(f"LLM response: {msg.content}")
-            msgs.append(msg)
+            print(f"LLM response: {content}")
+            msgs.append({"role":"assistant","content":content})
     except Exception as exception:  #pylint: disable=broad-except
         print(f"An error occurred during the OpenAI API call: {exception}")
     return msgs
 
-if __name__=="__main__":
+async def main():
+    """
+    This method runs the demo scenarios.
+    """
+
     print("Starting Human Oversight Agent Demo...")
     print(f"Agent Name: {AGENT_NAME}")
     print(f"Approvers: {APPROVERS}")
     print(f"Mock Users: {USERS}")
     human_oversight_agent_demo=None  #pylint: disable=invalid-name
     print("\n--- Scenario 1: List all users ---")
-    human_oversight_agent_demo=run_conversation("List all users",human_oversight_agent_demo)
+    human_oversight_agent_demo=await run_conversation("List all users",human_oversight_agent_demo)
     print("\n--- Scenario 2: Delete user with ID 1 ---")
     print("This will trigger the Human Oversight Approval Gate. Check the approver's inbox.")
-    human_oversight_agent_demo=run_conversation("Please delete the user with ID 1",human_oversight_agent_demo)
+    human_oversight_agent_demo=await run_conversation("Please delete the user with ID 1",human_oversight_agent_demo)
     print("\n--- Demo Finished ---")
     print(f"Remaining Mock Users: {USERS}")
+
+if __name__=="__main__":
+    asyncio.run(main())
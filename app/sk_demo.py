@@ -9,23 +9,17 @@ and a Critic agent that reviews the report and provides feedback.
 
 import asyncio
 import logging
-import os
-from dotenv import load_dotenv
-from typing import List
-
-from openai import AsyncAzureOpenAI
-from semantic_kernel import Kernel
-from semantic_kernel.agents import AgentGroupChat, ChatCompletionAgent
-from semantic_kernel.agents.strategies import (
-    KernelFunctionSelectionStrategy,
-    KernelFunctionTerminationStrategy,
-)
-from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
-from semantic_kernel.contents import ChatHistoryTruncationReducer
-from semantic_kernel.functions import KernelFunctionFromPrompt
-
-from sk_demo.github_api_plugin import GitHubPlugin
-from sk_demo.publish_plugin import PublishPlugin
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List
+
+from sk_demo.config import get_config
+from sk_demo.constants import COMPLETION_PHRASE, CRITIC_NAME, PUBLISHER_NAME, RESEARCHER_NAME
+
+# Semantic Kernel and OpenAI are imported where they are used, after the
+# configuration was validated, since importing them takes seconds
+if TYPE_CHECKING:
+    from semantic_kernel import Kernel
+    from semantic_kernel.agents import AgentGroupChat, ChatCompletionAgent
 
 # Logging Setup
 logger = logging.getLogger(__name__)
@@ -37,12 +31,11 @@ formatter = logging.Formatter("[%(levelname)s] %(name)s: %(message)s")
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
-# Define agent names
-RESEARCHER_NAME = "Researcher"
-CRITIC_NAME = "Critic"
-PUBLISHER_NAME = "Publisher"
 AGENT_NAME = "GitHubSearchAgent"
 
+# Older messages are summarized once the chat history grows past this many messages
+HISTORY_TARGET_COUNT = 10
+
 
 RESEARCHER_INSTRUCTIONS = """
 You are a Researcher agent that uses GitHub Search API to find information about code-related queries. 
@@ -50,10 +43,13 @@ Your goal is to search for relevant information on GitHub to help answer user qu
 
 Process:
 1. Analyze the user's query to identify key search terms.
-2. Use the github.search_code function with precise queries to find relevant code examples on GitHub.
+2. Use the github.search_code_batch function with a list of precise queries to find relevant code examples on GitHub.
+   Use github.search_code only for a single follow-up search.
 3. You MUST perform at least 4-5 different searches with different queries to gather comprehensive information.
+   Send them together in one github.search_code_batch call instead of one call per query.
 4. After gathering sufficient information from GitHub, compile a detailed report.
 5. When you receive feedback from the Critic, conduct additional searches to address gaps.
+   Cover all independent points of the feedback with one github.search_code_batch call; its searches run in parallel.
 
 Be thorough, methodical, and focus on providing accurate technical information from real GitHub repositories.
 """
@@ -95,103 +91,45 @@ publish.publish_gist(title="Informative Title", content="Full report content")
 After calling the function, end your message with "READY TO PUBLISH" to indicate completion.
 """
 
-SELECTION_PROMPT = f"""
-Examine the provided RESPONSE and choose the next participant.
-State only the name of the chosen participant without explanation.
-Never choose the participant named in the RESPONSE.
-
-Choose only from these participants:
-- {RESEARCHER_NAME}
-- {CRITIC_NAME}
-- {PUBLISHER_NAME}
-
-Rules:
-- If RESPONSE is user input, it is {RESEARCHER_NAME}'s turn.
-- If RESPONSE is by {RESEARCHER_NAME}, it is {CRITIC_NAME}'s turn.
-- If RESPONSE is by {CRITIC_NAME} and contains "REPORT APPROVED FOR PUBLICATION", it is {PUBLISHER_NAME}'s turn.
-- If RESPONSE is by {CRITIC_NAME} but does not contain approval, it is {RESEARCHER_NAME}'s turn.
-- If RESPONSE is by {PUBLISHER_NAME}, the conversation is complete.
-
-RESPONSE:
-{{{{$lastmessage}}}}
-"""
-
-TERMINATION_PROMPT = """
-Examine the RESPONSE and determine whether the conversation should terminate.
-If the Publisher has completed preparation (containing "READY TO PUBLISH"), respond with "terminate".
-Otherwise, respond with "continue".
-
-RESPONSE:
-{{{{$lastmessage}}}}
-"""
-
-
-# Initialize environment variables
-load_dotenv(override=True)
-APPROVER_EMAILS_STR = os.getenv("APPROVER_EMAILS")
-if not APPROVER_EMAILS_STR:
-    raise ValueError("APPROVER_EMAILS environment variable must be set (comma-separated).")
-APPROVERS = [e.strip() for e in APPROVER_EMAILS_STR.split(',')]
-
 # Conversation state to track searches, reports, etc.
+@dataclass(slots=True)
 class ConversationState:
     """
     Holds the state for a single conversation, including user query,
     searches made, final report, etc.
     """
-    def __init__(self) -> None:
-        self.query: str = ""
-        self.searches: List[str] = []
-        self.report: str = ""
-        self.feedback: List[str] = []
-        self.final_report: str = ""
-
-# Global state instance
-conversation_state = ConversationState()
-
-def validate_env_vars() -> List[str]:
-    """
-    Validates required environment variables and returns a list of approved emails.
-    Raises ValueError if missing critical values.
-    """
-    azure_openai_key = os.getenv("AZURE_OPENAI_API_KEY")
-    azure_openai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    if not azure_openai_key:
-        raise ValueError("AZURE_OPENAI_API_KEY environment variable must be set.")
-    if not azure_openai_endpoint:
-        raise ValueError("AZURE_OPENAI_ENDPOINT environment variable must be set.")
-
-    approver_emails_str = os.getenv("APPROVER_EMAILS")
-    if not approver_emails_str:
-        raise ValueError("APPROVER_EMAILS environment variable must be set (comma-separated).")
-
-    approvers = [e.strip() for e in approver_emails_str.split(',') if e.strip()]
-    if not approvers:
-        raise ValueError("No valid approvers found in APPROVER_EMAILS.")
-
-    return approvers
-
-
-def create_kernel() -> Kernel:
+    query: str = ""
+    searches: List[str] = field(default_factory=list)
+    report: str = ""
+    feedback: List[str] = field(default_factory=list)
+    final_report: str = ""
+
+    def reset(self) -> None:
+        """Clears the state in place, so plugins holding it see the new conversation."""
+        self.query = ""
+        self.searches = []
+        self.report = ""
+        self.feedback = []
+        self.final_report = ""
+
+def create_kernel() -> "Kernel":
     """Creates a Kernel instance with Azure OpenAI ChatCompletion service."""
+    # pylint: disable=import-outside-toplevel
+    from openai import AsyncAzureOpenAI
+    from semantic_kernel import Kernel
+    from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
+
     kernel = Kernel()
-    
-    # Use validate_env_vars to validate environment variables
-    validated_approvers = validate_env_vars()
-    
-    # Check if global APPROVERS needs to be updated
-    global APPROVERS
-    if validated_approvers:
-        APPROVERS = validated_approvers
-    
+    config = get_config()
+
     # Configure Azure OpenAI service
     chat_client = AsyncAzureOpenAI(
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2023-05-15"),
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+        api_key=config.azure_openai_api_key,
+        api_version=config.azure_openai_api_version,
+        azure_endpoint=config.azure_openai_endpoint
     )
     chat_completion_service = OpenAIChatCompletion(
-        ai_model_id=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o"),
+        ai_model_id=config.azure_openai_deployment,
         async_client=chat_client
     )
     kernel.add_service(chat_completion_service)
@@ -199,18 +137,23 @@ def create_kernel() -> Kernel:
     return kernel
 
 
-def init_agents(kernel: Kernel):
+def init_agents(kernel: "Kernel", conversation_state: ConversationState):
     """
     Creates three ChatCompletionAgent instances for Researcher, Critic, and Publisher.
+    The Publisher records the published report in `conversation_state`.
     Returns them as a tuple.
     """
+    # pylint: disable=import-outside-toplevel
+    from semantic_kernel.agents import ChatCompletionAgent
+    from sk_demo.github_api_plugin import GitHubPlugin
+    from sk_demo.publish_plugin import PublishPlugin
 
-    
+    github_plugin = GitHubPlugin()
     agent_researcher = ChatCompletionAgent(
         kernel=kernel,
         name=RESEARCHER_NAME,
         instructions=RESEARCHER_INSTRUCTIONS,
-        plugins=[GitHubPlugin()]
+        plugins=[github_plugin]
     )
 
     agent_critic = ChatCompletionAgent(
@@ -226,8 +169,9 @@ def init_agents(kernel: Kernel):
         plugins=[
             PublishPlugin(
                 agent_name=AGENT_NAME,
-                approvers=APPROVERS,
-                conversation_state=conversation_state
+                approvers=list(get_config().approvers),
+                conversation_state=conversation_state,
+                github_plugin=github_plugin
             )
         ]
     )
@@ -235,59 +179,52 @@ def init_agents(kernel: Kernel):
     return agent_researcher, agent_critic, agent_publisher
 
 def build_agent_group_chat(
-    kernel: Kernel,
-    agent_researcher: ChatCompletionAgent,
-    agent_critic: ChatCompletionAgent,
-    agent_publisher: ChatCompletionAgent
-) -> AgentGroupChat:
+    kernel: "Kernel",
+    agent_researcher: "ChatCompletionAgent",
+    agent_critic: "ChatCompletionAgent",
+    agent_publisher: "ChatCompletionAgent"
+) -> "AgentGroupChat":
     """
-    Constructs the AgentGroupChat with selection and termination strategies.
+    Constructs the AgentGroupChat with selection and termination strategies
+    and a chat history that summarizes older messages.
     """
-    selection_function = KernelFunctionFromPrompt(
-        function_name="selection",
-        prompt=SELECTION_PROMPT,
+    # pylint: disable=import-outside-toplevel
+    from semantic_kernel.agents import AgentGroupChat
+    from semantic_kernel.connectors.ai.chat_completion_client_base import ChatCompletionClientBase
+    from semantic_kernel.contents import ChatHistorySummarizationReducer
+    from sk_demo.strategies import ReadyToPublishTerminationStrategy, ResearchFlowSelectionStrategy
+
+    # Summarize older turns so long reports are not resent verbatim on every turn
+    history_reducer = ChatHistorySummarizationReducer(
+        service=kernel.get_service(type=ChatCompletionClientBase),
+        target_count=HISTORY_TARGET_COUNT,
+        fail_on_error=False,
     )
 
-    termination_function = KernelFunctionFromPrompt(
-        function_name="termination",
-        prompt=TERMINATION_PROMPT,
-    )
-
-    history_reducer = ChatHistoryTruncationReducer(target_count=10)
-
     chat = AgentGroupChat(
         agents=[agent_researcher, agent_critic, agent_publisher],
-        selection_strategy=KernelFunctionSelectionStrategy(
-            initial_agent=agent_researcher,
-            function=selection_function,
-            kernel=kernel,
-            result_parser=lambda result: str(result.value[0]).strip() if result.value[0] else RESEARCHER_NAME,
-            history_variable_name="lastmessage",
-            history_reducer=history_reducer,
-        ),
-        termination_strategy=KernelFunctionTerminationStrategy(
+        chat_history=history_reducer,
+        selection_strategy=ResearchFlowSelectionStrategy(initial_agent=agent_researcher),
+        termination_strategy=ReadyToPublishTerminationStrategy(
             agents=[agent_publisher],
-            function=termination_function,
-            kernel=kernel,
-            result_parser=lambda result: "terminate" in str(result.value[0]).lower(),
-            history_variable_name="lastmessage",
             maximum_iterations=20,
-            history_reducer=history_reducer,
         ),
     )
     return chat
 
-async def run_conversation_loop(chat: AgentGroupChat) -> None:
+async def run_conversation_loop(chat: "AgentGroupChat", conversation_state: ConversationState) -> None:
     """
     Runs the main conversation loop, prompting for user input,
     invoking the multi-agent pipeline, and printing results.
+
+    The same chat is kept for the whole conversation: user input is appended
+    to its history and each invoke continues with the existing agent channels.
+    Only "reset" tears the chat state down.
     """
     logger.info("Starting GitHub Search Agent Demo...")
     logger.info(f"Agent Name: {AGENT_NAME}")
 
-    # Print approvers from environment
-    approver_emails_str = os.getenv("APPROVER_EMAILS")
-    logger.info(f"Approvers: {approver_emails_str}")
+    logger.info(f"Approvers: {', '.join(get_config().approvers)}")
 
     logger.info("Please enter a code-related query or type 'exit' to quit.")
 
@@ -296,10 +233,11 @@ async def run_conversation_loop(chat: AgentGroupChat) -> None:
     while not is_complete:
         print()
         if not conversation_state.query:
-            user_input = input("Query > ").strip()
+            # Read input in a worker thread so background tasks keep running while the user types
+            user_input = (await asyncio.to_thread(input, "Query > ")).strip()
             conversation_state.query = user_input
         else:
-            user_input = input("Press Enter to continue or 'exit' to quit > ").strip()
+            user_input = (await asyncio.to_thread(input, "Press Enter to continue or 'exit' to quit > ")).strip()
             if not user_input:
                 user_input = "Continue processing the query."
 
@@ -311,7 +249,7 @@ async def run_conversation_loop(chat: AgentGroupChat) -> None:
             await chat.reset()
             logger.info("[Conversation has been reset]")
             # Reset conversation state
-            conversation_state.__init__()  # re-init fields
+            conversation_state.reset()
             continue
 
         await chat.add_chat_message(message=user_input)
@@ -325,7 +263,7 @@ async def run_conversation_loop(chat: AgentGroupChat) -> None:
                 print(f"# {response.name.upper()}:\n{response.content}")
 
                 # If the Publisher agent says "READY TO PUBLISH", end the loop
-                if response.name == PUBLISHER_NAME and "READY TO PUBLISH" in response.content:
+                if response.name == PUBLISHER_NAME and COMPLETION_PHRASE in response.content:
                     is_complete = True
                     break
 
@@ -333,6 +271,9 @@ async def run_conversation_loop(chat: AgentGroupChat) -> None:
             logger.exception(f"Error during chat invocation: {exc}")
             break
 
+        if await chat.reduce_history():
+            logger.info("Summarized older messages of the conversation.")
+
     # Final summary
     print("\n--- Demo Finished ---")
     if conversation_state.final_report:
@@ -343,17 +284,18 @@ async def run_conversation_loop(chat: AgentGroupChat) -> None:
 async def main() -> None:
     """
     Orchestrates the entire flow:
-    1. Loads environment variables
+    1. Loads and validates the configuration
     2. Creates a Kernel
     3. Initializes agents
     4. Builds an AgentGroupChat
     5. Runs the conversation loop
     """
-    load_dotenv(override=True)
+    get_config()
     kernel = create_kernel()
-    agent_researcher, agent_critic, agent_publisher = init_agents(kernel)
+    conversation_state = ConversationState()
+    agent_researcher, agent_critic, agent_publisher = init_agents(kernel, conversation_state)
     chat = build_agent_group_chat(kernel, agent_researcher, agent_critic, agent_publisher)
-    await run_conversation_loop(chat)
+    await run_conversation_loop(chat, conversation_state)
 
 if __name__ == "__main__":
     asyncio.run(main())
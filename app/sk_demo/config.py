@@ -0,0 +1,56 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+
+"""Configuration of the sk_demo module, read from the environment once."""
+
+import functools
+import os
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from dotenv import load_dotenv
+
+from .constants import DEFAULT_AZURE_OPENAI_API_VERSION, DEFAULT_AZURE_OPENAI_DEPLOYMENT
+
+
+@dataclass(frozen=True, slots=True)
+class DemoConfig:
+    """Validated settings of the Semantic Kernel demo."""
+    approvers: Tuple[str, ...]
+    azure_openai_endpoint: str
+    azure_openai_api_key: str = field(repr=False)
+    azure_openai_deployment: str
+    azure_openai_api_version: str
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> DemoConfig:
+    """
+    Loads the .env file and returns the validated demo settings.
+    The environment is only read on the first call.
+    Raises ValueError if missing critical values.
+    """
+    load_dotenv(override=True)
+
+    azure_openai_key = os.getenv("AZURE_OPENAI_API_KEY")
+    azure_openai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not azure_openai_key:
+        raise ValueError("AZURE_OPENAI_API_KEY environment variable must be set.")
+    if not azure_openai_endpoint:
+        raise ValueError("AZURE_OPENAI_ENDPOINT environment variable must be set.")
+
+    approver_emails_str = os.getenv("APPROVER_EMAILS")
+    if not approver_emails_str:
+        raise ValueError("APPROVER_EMAILS environment variable must be set (comma-separated).")
+
+    approvers = tuple(e.strip() for e in approver_emails_str.split(',') if e.strip())
+    if not approvers:
+        raise ValueError("No valid approvers found in APPROVER_EMAILS.")
+
+    return DemoConfig(
+        approvers=approvers,
+        azure_openai_endpoint=azure_openai_endpoint,
+        azure_openai_api_key=azure_openai_key,
+        azure_openai_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", DEFAULT_AZURE_OPENAI_DEPLOYMENT),
+        azure_openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_AZURE_OPENAI_API_VERSION)
+    )
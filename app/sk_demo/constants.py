@@ -4,3 +4,41 @@
 """Constants used in the sk_demo module."""
 
 HTTP_TIMEOUT_SECONDS = 120  # HTTP request timeout in seconds
+ERROR_BODY_MAX_CHARS = 500  # Characters of a failed GitHub response body that are logged
+GITHUB_API_URL = "https://api.github.com"  # Base URL of the GitHub REST and GraphQL APIs
+GITHUB_RAW_MEDIA_TYPE = "application/vnd.github.raw+json"  # Returns file contents as raw bytes, other contents as JSON
+HTTP_POOL_CONNECTIONS = 4  # Number of host connection pools kept by the GitHub session
+HTTP_POOL_MAXSIZE = 20  # Maximum number of keep-alive connections per host
+HTTP_MAX_RETRIES = 3  # Retries for connection errors and retryable gateway responses
+HTTP_RETRY_BACKOFF_FACTOR = 0.3  # Backoff factor between retries in seconds
+HTTP_RETRY_STATUS_CODES = (502, 503, 504)  # Gateway responses worth retrying
+SEARCH_CACHE_TTL_SECONDS = 300  # How long GitHub code search results are reused
+SEARCH_CACHE_MAX_ENTRIES = 512  # Maximum number of cached GitHub code searches
+ETAG_CACHE_MAX_ENTRIES = 1024  # Maximum number of GitHub responses kept for ETag revalidation
+SEARCH_RATE_PERIOD_SECONDS = 60  # Window of the GitHub code search rate limit
+SEARCH_RATE_LIMIT_PER_TOKEN = 9  # Code searches per window for each token, one below GitHub's 10 per minute
+SEARCH_BATCH_MAX_WORKERS = 5  # Maximum number of searches of a batch running at the same time
+# Extensions of search hits that are binary, so no content preview is fetched for them
+BINARY_FILE_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp",
+    ".pdf", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".jar", ".whl",
+    ".exe", ".dll", ".so", ".dylib", ".bin", ".o", ".a", ".pyc", ".class",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".wav", ".mov", ".avi",
+})
+CONTENT_PREVIEW_CHARS = 1000  # Characters of each search hit shown as its content preview
+CONTENT_PREVIEW_MAX_BYTES = 4 * CONTENT_PREVIEW_CHARS  # Bytes downloaded for a preview, enough for any UTF-8 text
+FILE_FETCH_MAX_WORKERS = 8  # Maximum number of search hits whose contents are fetched at the same time
+BRANCH_PROBE_MAX_WORKERS = 8  # Maximum number of branch probes for file contents running at the same time
+DEFAULT_BRANCH_CANDIDATES = ("main", "master", "develop", "dev")  # Branches probed, in order, without a default branch
+DEFAULT_BRANCH_CACHE_TTL_SECONDS = 3600  # How long the default branch of a repository is reused
+DEFAULT_AZURE_OPENAI_DEPLOYMENT = "gpt-4o"  # Deployment used when AZURE_OPENAI_DEPLOYMENT_NAME is not set
+DEFAULT_AZURE_OPENAI_API_VERSION = "2023-05-15"  # API version used when AZURE_OPENAI_API_VERSION is not set
+
+# Agent names
+RESEARCHER_NAME = "Researcher"
+CRITIC_NAME = "Critic"
+PUBLISHER_NAME = "Publisher"
+
+# Phrases driving the turn order
+APPROVAL_PHRASE = "REPORT APPROVED FOR PUBLICATION"  # The Critic approves the report
+COMPLETION_PHRASE = "READY TO PUBLISH"  # The Publisher completed the publication
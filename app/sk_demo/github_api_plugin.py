@@ -5,16 +5,154 @@
 GitHub Plugin for Semantic Kernel
 """
 
-from typing import Annotated
+from typing import Annotated, Dict, List, Optional, Tuple
 
+import atexit
 import os
-import json
+import posixpath
 import base64
+import codecs
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
-from .constants import HTTP_TIMEOUT_SECONDS
+from .constants import (BINARY_FILE_EXTENSIONS, BRANCH_PROBE_MAX_WORKERS, CONTENT_PREVIEW_CHARS,
+                        CONTENT_PREVIEW_MAX_BYTES, DEFAULT_BRANCH_CACHE_TTL_SECONDS,
+                        DEFAULT_BRANCH_CANDIDATES, ERROR_BODY_MAX_CHARS, ETAG_CACHE_MAX_ENTRIES,
+                        FILE_FETCH_MAX_WORKERS, GITHUB_API_URL, GITHUB_RAW_MEDIA_TYPE,
+                        HTTP_MAX_RETRIES, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                        HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_STATUS_CODES, HTTP_TIMEOUT_SECONDS,
+                        SEARCH_BATCH_MAX_WORKERS, SEARCH_CACHE_MAX_ENTRIES,
+                        SEARCH_CACHE_TTL_SECONDS, SEARCH_RATE_LIMIT_PER_TOKEN,
+                        SEARCH_RATE_PERIOD_SECONDS)
+
+def _create_session() -> requests.Session:
+    """
+    Create the HTTP session shared by all GitHub calls.
+    
+    The pool is sized for the concurrent searches and branch probes, so they
+    reuse keep-alive connections to api.github.com instead of each opening a
+    new TCP and TLS connection. POST requests keep urllib3's default of only
+    being retried when the connection could not be established, so a gist is
+    never created twice.
+    """
+    session = requests.Session()
+    session.headers.update({
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "GithubSearchAgent"
+    })
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_CODES
+        )
+    )
+    session.mount("https://", adapter)
+    return session
+
+logger = logging.getLogger(__name__)
+
+# Endpoints of the GitHub API
+_SEARCH_CODE_URL = f"{GITHUB_API_URL}/search/code"
+_REPO_URL_TEMPLATE = GITHUB_API_URL + "/repos/{}"
+_CONTENTS_URL_TEMPLATE = GITHUB_API_URL + "/repos/{}/contents/{}"
+_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+_GISTS_URL = f"{GITHUB_API_URL}/gists"
+
+# Shared session so all GitHub calls reuse pooled keep-alive connections to api.github.com
+_SESSION = _create_session()
+atexit.register(_SESSION.close)
+
+# Threads probing candidate branches of a file at the same time
+_BRANCH_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=BRANCH_PROBE_MAX_WORKERS, thread_name_prefix="github-branch-probe")
+
+# Successful code searches by (query, page, per_page, tokens), with their expiry on the monotonic clock,
+# least recently used first
+_SEARCH_CACHE: OrderedDict[Tuple[str, int, int, Tuple[str, ...]], Tuple[float, dict]] = OrderedDict()
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+# Default branches by repository, with their expiry on the monotonic clock
+_DEFAULT_BRANCH_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# Bodies and content types of GitHub GET responses by (url, params, accept, max_bytes, tokens),
+# with the ETag to revalidate them
+_ETAG_CACHE: Dict[Tuple[str, Tuple, Optional[str], Optional[int], Tuple[str, ...]], Tuple[str, str, bytes]] = {}
+_ETAG_CACHE_LOCK = threading.Lock()
+
+class RateLimiter:
+    """
+    Paces calls so that at most `max_calls` start within any `period_seconds` window.
+    
+    Waiting before a request is cheaper than running into GitHub's rate limit
+    and waiting for the limit to reset after a 403/429 response.
+    """
+
+    def __init__(self, max_calls: int, period_seconds: float):
+        self.max_calls = max_calls
+        self.period_seconds = period_seconds
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until another call may start."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period_seconds:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait_seconds = self.period_seconds - (now - self._calls[0])
+            time.sleep(wait_seconds)
+
+class TokenPool:
+    """
+    Hands out GitHub tokens in turn, so each token's rate limit adds to the others.
+    
+    A token whose rate limit is used up is skipped until GitHub resets it.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tuple(tokens)
+        self._cycle = itertools.cycle(tokens)
+        self._reset_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def next_token(self) -> Optional[str]:
+        """Get the next token whose rate limit is not used up, or None without tokens."""
+        if not self.tokens:
+            return None
+        with self._lock:
+            now = time.time()
+            for _ in self.tokens:
+                token = next(self._cycle)
+                if self._reset_times.get(token, 0) <= now:
+                    return token
+            # Every token is used up, so use the one that resets first
+            return min(self.tokens, key=lambda token: self._reset_times[token])
+
+    def report(self, token: Optional[str], response: requests.Response) -> None:
+        """Mark a token as used up until its reset time if the response says its rate limit ran out."""
+        if token is None or response.status_code not in (403, 429):
+            return
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+        reset = response.headers.get("X-RateLimit-Reset", "")
+        with self._lock:
+            self._reset_times[token] = float(reset) if reset.isdigit() else time.time() + SEARCH_RATE_PERIOD_SECONDS
 
 class GitHubPlugin:
     """
@@ -25,19 +163,78 @@ class GitHubPlugin:
     """
 
     def __init__(self):
+        # GITHUB_TOKENS adds more tokens to take turns with; GITHUB_TOKEN stays the one gists are created with
         self.token = os.getenv("GITHUB_TOKEN")
-        self.base_url = "https://api.github.com"
-        if not self.token:
-            print("Warning: GITHUB_TOKEN not set. API calls may be rate-limited.")
-
-    def _get_headers(self):
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GithubSearchAgent"
+        tokens = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
+        if self.token and self.token not in tokens:
+            tokens.insert(0, self.token)
+        self.token_pool = TokenPool(tokens)
+        # Request headers per token are built once; Accept and User-Agent are set on the shared session
+        self._headers_by_token: Dict[Optional[str], Dict[str, str]] = {
+            token: {"Authorization": f"token {token}"} for token in tokens
         }
-        if self.token:
-            headers["Authorization"] = f"token {self.token}"
-        return headers
+        self._headers_by_token[None] = {}
+        if not tokens:
+            logger.warning("GITHUB_TOKEN not set. API calls may be rate-limited.")
+        # Code search requires a token, so without one there is no rate to pace the searches to
+        self.search_limiter: Optional[RateLimiter] = None
+        if tokens:
+            self.search_limiter = RateLimiter(SEARCH_RATE_LIMIT_PER_TOKEN * len(tokens), SEARCH_RATE_PERIOD_SECONDS)
+
+    def _conditional_get(
+        self,
+        url: str,
+        params: dict,
+        accept: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> Tuple[int, str, bytes]:
+        """
+        GET a GitHub resource, revalidating a previously downloaded body with its ETag.
+        
+        A 304 Not Modified response has no body and does not count against the
+        rate limit, so it is answered with the cached body as a 200. Returns the
+        status code, content type and body; `accept` overrides the session's
+        JSON media type and `max_bytes` limits the body to its first bytes.
+        """
+        cache_key = (url, tuple(sorted(params.items())), accept, max_bytes, self.token_pool.tokens)
+        entry = _ETAG_CACHE.get(cache_key)
+        token = self.token_pool.next_token()
+        headers = {**self._headers_by_token[token]}
+        if accept:
+            headers["Accept"] = accept
+        if max_bytes:
+            headers["Range"] = f"bytes=0-{max_bytes - 1}"
+        if entry is not None:
+            headers["If-None-Match"] = entry[0]
+
+        response = _SESSION.get(
+            url, headers=headers, params=params, timeout=HTTP_TIMEOUT_SECONDS, stream=max_bytes is not None
+        )
+        self.token_pool.report(token, response)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            return 200, entry[1], entry[2]
+
+        content_length = response.headers.get("Content-Length")
+        if max_bytes is None or (content_length is not None and int(content_length) <= max_bytes):
+            content = response.content
+        else:
+            # The range was not honored, so stop reading at the limit and drop the rest of the body
+            content = response.raw.read(max_bytes, decode_content=True)
+            response.close()
+        # A partial response to the range is the whole of what was asked for
+        status_code = 200 if response.status_code == 206 else response.status_code
+
+        content_type = response.headers.get("Content-Type", "")
+        etag = response.headers.get("ETag")
+        if status_code == 200 and etag:
+            with _ETAG_CACHE_LOCK:
+                _ETAG_CACHE.pop(cache_key, None)
+                if len(_ETAG_CACHE) >= ETAG_CACHE_MAX_ENTRIES:
+                    # Evict the oldest response
+                    del _ETAG_CACHE[next(iter(_ETAG_CACHE))]
+                _ETAG_CACHE[cache_key] = (etag, content_type, content)
+        return status_code, content_type, content
 
     @kernel_function(
         description="Search GitHub code with the given query",
@@ -50,46 +247,175 @@ class GitHubPlugin:
         per_page: Annotated[int, "Number of results per page"] = 5
     ) -> Annotated[str, "JSON string containing search results"]:
         """Search GitHub code with the given query."""
-        print(f"Executing search_code(query='{query}', page={page}, per_page={per_page})...")
+        return orjson.dumps(self._search_code(query, page, per_page)).decode()
+
+    @kernel_function(
+        description="Search GitHub code with several queries in a single call",
+        name="search_code_batch"
+    )
+    def search_code_batch(
+        self,
+        queries: Annotated[List[str], "The search queries for GitHub code search"],
+        per_page: Annotated[int, "Number of results per page for each query"] = 5
+    ) -> Annotated[str, "JSON string containing the search results of each query, in order"]:
+        """Search GitHub code with several queries, so one tool call replaces one model turn per query."""
+        # The searches are independent, so they run concurrently; map keeps the query order
+        with ThreadPoolExecutor(max_workers=min(SEARCH_BATCH_MAX_WORKERS, len(queries) or 1)) as executor:
+            results = executor.map(lambda query: self._search_code(query, 1, per_page), queries)
+            return orjson.dumps({
+                "status": "success",
+                "results": [
+                    {"query": query, **result}
+                    for query, result in zip(queries, results)
+                ]
+            }).decode()
+
+    def _search_code(self, query: str, page: int, per_page: int) -> dict:
+        """Search GitHub code and return the formatted results, reusing recent identical searches."""
+        cache_key = (" ".join(query.split()), page, per_page, self.token_pool.tokens)
+        with _SEARCH_CACHE_LOCK:
+            entry = _SEARCH_CACHE.get(cache_key)
+            if entry is not None and time.monotonic() < entry[0]:
+                _SEARCH_CACHE.move_to_end(cache_key)
+            else:
+                entry = None
+        if entry is not None:
+            logger.debug("Reusing cached search_code(query=%r, page=%s, per_page=%s)", query, page, per_page)
+            return entry[1]
+
+        result = self._fetch_search_results(query, page, per_page)
+        if "error" not in result:
+            with _SEARCH_CACHE_LOCK:
+                _SEARCH_CACHE.pop(cache_key, None)
+                if len(_SEARCH_CACHE) >= SEARCH_CACHE_MAX_ENTRIES:
+                    # Evict the least recently used search
+                    _SEARCH_CACHE.popitem(last=False)
+                _SEARCH_CACHE[cache_key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, result)
+        return result
+
+    def _fetch_search_results(self, query: str, page: int, per_page: int) -> dict:
+        """Search GitHub code and return the formatted results."""
+        logger.debug("Executing search_code(query=%r, page=%s, per_page=%s)", query, page, per_page)
 
-        url = f"{self.base_url}/search/code"
+        url = _SEARCH_CODE_URL
         params = {
             "q": query,
             "page": page,
             "per_page": per_page,
         }
 
-        response = requests.get(url, headers=self._get_headers(), params=params, timeout=HTTP_TIMEOUT_SECONDS)
-        if response.status_code != 200:
-            print(f"Error searching code: {response.status_code}")
-            print(response.text)
-            return json.dumps({"items": [], "error": response.text})
+        if self.search_limiter is not None:
+            self.search_limiter.acquire()
+        status_code, _, content = self._conditional_get(url, params)
+        if status_code != 200:
+            error = content.decode("utf-8", "replace")
+            logger.error("Error searching code: %s %s", status_code, error[:ERROR_BODY_MAX_CHARS])
+            return {"items": [], "error": error}
 
-        result_data = response.json()
+        result_data = orjson.loads(content)
+
+        items = result_data.get("items", [])
+        files = [(item.get("repository", {}).get("full_name", ""), item.get("path", "")) for item in items]
+
+        # Binary files have no text to preview, so their contents are not fetched at all
+        binary = [posixpath.splitext(path)[1].lower() in BINARY_FILE_EXTENSIONS for _, path in files]
+        text_indexes = [index for index, is_binary in enumerate(binary) if not is_binary]
+        contents: List[Optional[str]] = ["" if is_binary else None for is_binary in binary]
+
+        # With a token, the contents of all hits on their default branch come from one GraphQL request
+        if self.token_pool.tokens and text_indexes:
+            default_branch_contents = self._get_default_branch_contents([files[index] for index in text_indexes])
+            if default_branch_contents is not None:
+                for index, content in zip(text_indexes, default_branch_contents):
+                    contents[index] = content
+
+        # The remaining files are fetched over REST; the fetches wait on the network, so they run concurrently
+        missing = [index for index, content in enumerate(contents) if content is None]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(FILE_FETCH_MAX_WORKERS, len(missing))) as executor:
+                # Don't specify a ref to try the default branch or multiple branches
+                # Only the start of each file is shown, so only that much is downloaded
+                fetched = executor.map(
+                    lambda index: self._get_file_content(*files[index], None, CONTENT_PREVIEW_MAX_BYTES), missing
+                )
+                for index, content in zip(missing, fetched):
+                    contents[index] = content
 
         # Format results with content previews
         formatted_results = []
-        for item in result_data.get("items", []):
-            repo = item.get("repository", {}).get("full_name", "")
-            path = item.get("path", "")
+        for item, (repo, path), content, is_binary in zip(items, files, contents, binary):
             url = item.get("html_url", "")
+            content_preview = (
+                content[:CONTENT_PREVIEW_CHARS] + "..." if len(content) > CONTENT_PREVIEW_CHARS else content
+            )
 
-            # Try to get the file content - don't specify a ref to try multiple branches
-            content = self.get_file_content(repo, path, ref=None)
-            content_preview = content[:1000] + "..." if len(content) > 1000 else content
-
-            formatted_results.append({
+            formatted_result = {
                 "repo": repo,
                 "path": path,
                 "url": url,
                 "content_preview": content_preview
-            })
+            }
+            if is_binary:
+                formatted_result["binary"] = True
+            formatted_results.append(formatted_result)
 
-        return json.dumps({
+        return {
             "status": "success", 
             "total_count": result_data.get("total_count", 0),
             "items": formatted_results
-        })
+        }
+
+    def _get_default_branch_contents(self, files: List[Tuple[str, str]]) -> Optional[List[Optional[str]]]:
+        """
+        Get the text of several files on their repository's default branch with one GraphQL request.
+        
+        GitHub's GraphQL API cannot search code, but it can read any number of
+        blobs in one query, replacing a REST request per file and per probed
+        branch. Files that are missing or binary are None, and so is the whole
+        result if the request fails, so the caller can fall back to REST.
+        """
+        logger.debug("Executing GraphQL file contents query for %s files", len(files))
+
+        variable_definitions = []
+        fields = []
+        variables = {}
+        for index, (repo, path) in enumerate(files):
+            owner, _, name = repo.partition("/")
+            variable_definitions.append(f"$owner{index}: String!, $name{index}: String!, $expression{index}: String!")
+            fields.append(
+                f"file{index}: repository(owner: $owner{index}, name: $name{index}) "
+                f"{{ object(expression: $expression{index}) {{ ... on Blob {{ text }} }} }}"
+            )
+            variables[f"owner{index}"] = owner
+            variables[f"name{index}"] = name
+            variables[f"expression{index}"] = f"HEAD:{path}"
+        query = f"query({', '.join(variable_definitions)}) {{ {' '.join(fields)} }}"
+
+        try:
+            token = self.token_pool.next_token()
+            response = _SESSION.post(
+                _GRAPHQL_URL,
+                headers={**self._headers_by_token[token], "Content-Type": "application/json"},
+                data=orjson.dumps({"query": query, "variables": variables}),
+                timeout=HTTP_TIMEOUT_SECONDS
+            )
+            self.token_pool.report(token, response)
+            if response.status_code != 200:
+                logger.error(
+                    "Error getting file contents with GraphQL: %s %s",
+                    response.status_code, response.content[:ERROR_BODY_MAX_CHARS].decode("utf-8", "replace")
+                )
+                return None
+            # Repositories that cannot be read are null alongside an entry in "errors"
+            data = orjson.loads(response.content).get("data") or {}
+        except Exception as exception:  #pylint: disable=broad-except
+            logger.error("Exception while getting file contents with GraphQL: %s", exception)
+            return None
+
+        return [
+            ((data.get(f"file{index}") or {}).get("object") or {}).get("text")
+            for index in range(len(files))
+        ]
 
     @kernel_function(
         description="Get contents of a file from GitHub",
@@ -102,40 +428,94 @@ class GitHubPlugin:
         ref: Annotated[str, "The branch, tag, or commit SHA"] = None
     ) -> Annotated[str, "The content of the file"]:
         """Get contents of a file from GitHub."""
-        print(f"Executing get_file_content(repo='{repo}', path='{path}', ref='{ref}')...")
+        return self._get_file_content(repo, path, ref)
 
-        # Try multiple common branch names if no ref is specified
-        branches_to_try = [ref] if ref else ["main", "master", "develop", "dev"]
-        branches_to_try = [b for b in branches_to_try if b]  # Remove None values
+    def _get_file_content(self, repo: str, path: str, ref: Optional[str], max_bytes: Optional[int] = None) -> str:
+        """Get contents of a file from GitHub, or only its first `max_bytes` bytes."""
+        logger.debug("Executing get_file_content(repo=%r, path=%r, ref=%r)", repo, path, ref)
 
-        for branch in branches_to_try:
-            url = f"{self.base_url}/repos/{repo}/contents/{path}"
-            params = {"ref": branch} if branch else {}
+        # Without a ref, look up the default branch and only try common branch names if that fails
+        if not ref:
+            ref = self._get_default_branch(repo)
+        branches_to_try = [ref] if ref else list(DEFAULT_BRANCH_CANDIDATES)
 
-            try:
-                response = requests.get(url, headers=self._get_headers(), params=params, timeout=HTTP_TIMEOUT_SECONDS)
-
-                if response.status_code == 200:
-                    content_data = response.json()
-                    if content_data.get("encoding") == "base64":
-                        try:
-                            return base64.b64decode(content_data["content"]).decode("utf-8")
-                        except Exception as exception:  #pylint: disable=broad-except
-                            print(f"Error decoding content: {exception}")
-                            continue
-                else:
-                    # Only show error for the last branch attempt
-                    if branch == branches_to_try[-1]:
-                        print(f"Error getting file content: {response.status_code}")
-                        print(response.text)
-            except Exception as exception:  #pylint: disable=broad-except
-                # Only show error for the last branch attempt
-                if branch == branches_to_try[-1]:
-                    print(f"Exception while getting file content: {exception}")
+        # The probes are independent, so they run concurrently; the first branch in order that has the file wins
+        futures = [
+            _BRANCH_PROBE_EXECUTOR.submit(self._get_file_content_on_branch, repo, path, branch, max_bytes)
+            for branch in branches_to_try
+        ]
+        error = None
+        for index, future in enumerate(futures):
+            content, error = future.result()
+            if content is not None:
+                for pending in futures[index + 1:]:
+                    pending.cancel()
+                return content
+
+        # Only show the error of the last branch attempt
+        if error:
+            logger.error("Error getting file content: %s", error[:ERROR_BODY_MAX_CHARS])
 
         # If we get here, we couldn't find the file on any branch
         return f"[Could not retrieve content for {repo}/{path}]"
 
+    def _get_default_branch(self, repo: str) -> Optional[str]:
+        """Get the default branch of a repository, or None if it cannot be retrieved."""
+        entry = _DEFAULT_BRANCH_CACHE.get(repo)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+
+        try:
+            status_code, _, content = self._conditional_get(_REPO_URL_TEMPLATE.format(repo), {})
+            if status_code != 200:
+                return None
+            default_branch = orjson.loads(content).get("default_branch")
+        except Exception as exception:  #pylint: disable=broad-except
+            logger.error("Exception while getting default branch: %s", exception)
+            return None
+
+        if default_branch:
+            _DEFAULT_BRANCH_CACHE[repo] = (time.monotonic() + DEFAULT_BRANCH_CACHE_TTL_SECONDS, default_branch)
+        return default_branch
+
+    def _get_file_content_on_branch(
+        self,
+        repo: str,
+        path: str,
+        branch: str,
+        max_bytes: Optional[int] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Get the decoded contents of a file on one branch, or None and the reason it could not be retrieved."""
+        url = _CONTENTS_URL_TEMPLATE.format(repo, path)
+        params = {"ref": branch}
+
+        try:
+            # Files come back as their raw bytes, saving the base64 envelope and its decoding
+            status_code, content_type, content = self._conditional_get(
+                url, params, accept=GITHUB_RAW_MEDIA_TYPE, max_bytes=max_bytes
+            )
+
+            if status_code != 200:
+                body = content[:ERROR_BODY_MAX_CHARS].decode("utf-8", "replace")
+                return None, f"{status_code} {body}"
+            if content_type.startswith("application/json"):
+                # Directories and other contents without raw bytes still come back as JSON
+                content_data = orjson.loads(content)
+                if isinstance(content_data, dict) and content_data.get("encoding") == "base64":
+                    content = base64.b64decode(content_data["content"])
+                else:
+                    return None, None
+            try:
+                if max_bytes is not None:
+                    # A cut-off body can end inside a character, which is dropped instead of failing
+                    return codecs.getincrementaldecoder("utf-8")().decode(content[:max_bytes]), None
+                return content.decode("utf-8"), None
+            except UnicodeDecodeError as exception:
+                logger.error("Error decoding content: %s", exception)
+        except Exception as exception:  #pylint: disable=broad-except
+            return None, f"Exception: {exception}"
+        return None, None
+
     def create_gist(
         self,
         description: Annotated[str, "The description/title for the GitHub Gist"],
@@ -146,7 +526,7 @@ class GitHubPlugin:
         if not self.token:
             return "Error: GitHub token is required to create gists."
 
-        url = f"{self.base_url}/gists"
+        url = _GISTS_URL
         payload = {
             "description": description,
             "public": public,
@@ -157,10 +537,15 @@ class GitHubPlugin:
             }
         }
 
-        response = requests.post(url, headers=self._get_headers(), json=payload, timeout=HTTP_TIMEOUT_SECONDS)
+        response = _SESSION.post(
+            url,
+            headers={**self._headers_by_token[self.token], "Content-Type": "application/json"},
+            data=orjson.dumps(payload),
+            timeout=HTTP_TIMEOUT_SECONDS
+        )
         if response.status_code != 201:
-            print(f"Error creating gist: {response.status_code}")
-            print(response.text)
-            return f"Error creating gist: {response.text}"
+            error = response.content.decode("utf-8", "replace")
+            logger.error("Error creating gist: %s %s", response.status_code, error[:ERROR_BODY_MAX_CHARS])
+            return f"Error creating gist: {error}"
 
-        return response.json()["html_url"]
+        return orjson.loads(response.content)["html_url"]
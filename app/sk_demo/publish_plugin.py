@@ -5,23 +5,30 @@
 GitHub Plugin for Semantic Kernel
 """
 
-import json
+import logging
+
+import orjson
 from semantic_kernel.functions import kernel_function
 
 from sk_demo.github_api_plugin import GitHubPlugin
 from human_oversight import approval_gate
 
+logger = logging.getLogger(__name__)
+
 class PublishPlugin:
     """
     Plugin for publishing content to GitHub Gists.
     Includes human approval flow for sensitive operations.
     """
 
-    def __init__(self, agent_name=None, approvers=None, conversation_state=None):
-        self.github_plugin = GitHubPlugin()
+    def __init__(self, agent_name=None, approvers=None, conversation_state=None, github_plugin=None):
+        # Sharing the researcher's GitHubPlugin avoids reading the tokens and building their headers twice
+        self.github_plugin = github_plugin if github_plugin is not None else GitHubPlugin()
         self.agent_name = agent_name
         self.approvers = approvers
         self.conversation_state = conversation_state
+        # The gated function only depends on these attributes, so it is decorated once
+        self._approved_publish_gist = self._get_approval_gated_function()
 
     @kernel_function(
         description="Publish the final report as a GitHub Gist",
@@ -38,8 +45,7 @@ class PublishPlugin:
         Returns:
             JSON string with the status and URL of the created Gist
         """
-        approved_function = self._get_approval_gated_function()
-        return approved_function(title, content)
+        return self._approved_publish_gist(title, content)
 
     def _get_approval_gated_function(self):
         """Create and return the approval-gated function for publishing gists."""
@@ -50,17 +56,17 @@ class PublishPlugin:
             refusal_return_value="DENIED: Gist publication was not approved."
         )
         def _publish_gist_with_approval(title: str, content: str) -> str:
-            print(f"Executing publish_gist(title='{title}')...")
+            logger.debug("Executing publish_gist(title=%r)", title)
 
             if self.conversation_state is not None:
                 self.conversation_state.final_report = content
 
             gist_url = self.github_plugin.create_gist(title, content, False)
 
-            return json.dumps({
+            return orjson.dumps({
                 "status": "success",
                 "message": "Gist published successfully.",
                 "url": gist_url
-            })
+            }).decode()
 
         return _publish_gist_with_approval
@@ -0,0 +1,45 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+
+"""
+Agent selection and termination strategies for the GitHub search group chat.
+"""
+
+from semantic_kernel.agents import Agent
+from semantic_kernel.agents.strategies import SequentialSelectionStrategy, TerminationStrategy
+from semantic_kernel.contents import AuthorRole, ChatMessageContent
+
+from .constants import APPROVAL_PHRASE, COMPLETION_PHRASE, CRITIC_NAME, PUBLISHER_NAME, RESEARCHER_NAME
+
+
+def select_next_agent_name(last_message: ChatMessageContent | None) -> str:
+    """
+    Chooses the agent taking the next turn from the last message.
+    
+    The turn order is fixed, so it is evaluated here instead of asking the model:
+    - User input and Critic feedback without approval go to the Researcher.
+    - Researcher reports go to the Critic.
+    - Critic feedback containing the approval phrase goes to the Publisher.
+    """
+    if last_message is None or last_message.role == AuthorRole.USER:
+        return RESEARCHER_NAME
+    if last_message.name == RESEARCHER_NAME:
+        return CRITIC_NAME
+    if last_message.name == CRITIC_NAME and APPROVAL_PHRASE in (last_message.content or ""):
+        return PUBLISHER_NAME
+    return RESEARCHER_NAME
+
+
+class ResearchFlowSelectionStrategy(SequentialSelectionStrategy):
+    """Selects the next agent with select_next_agent_name, without a model call."""
+
+    async def select_agent(self, agents: list[Agent], history: list[ChatMessageContent]) -> Agent:
+        next_name = select_next_agent_name(history[-1] if history else None)
+        return next(agent for agent in agents if agent.name == next_name)
+
+
+class ReadyToPublishTerminationStrategy(TerminationStrategy):
+    """Ends the conversation once the Publisher reports completion, without a model call."""
+
+    async def should_agent_terminate(self, agent: Agent, history: list[ChatMessageContent]) -> bool:
+        return bool(history) and COMPLETION_PHRASE in (history[-1].content or "")
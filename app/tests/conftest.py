@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+
+"""
+Shared fixtures for the human_oversight tests.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from human_oversight import approval, decorator, logging_utils
+
+MOCK_TIMESTAMP = "2025-04-13T12:00:00.000000Z"
+
+
+@pytest.fixture
+def mock_log_event(monkeypatch):
+    """Replace log_approval_event where the decorator calls it."""
+    mock = MagicMock()
+    monkeypatch.setattr(decorator, "log_approval_event", mock)
+    return mock
+
+
+@pytest.fixture
+def mock_timestamp(monkeypatch):
+    """Make get_current_timestamp return MOCK_TIMESTAMP in every module using it."""
+    mock = MagicMock(return_value=MOCK_TIMESTAMP)
+    for module in (approval, decorator, logging_utils):
+        monkeypatch.setattr(module, "get_current_timestamp", mock)
+    return mock
+
+
+@pytest.fixture
+def logic_app_configured(monkeypatch):
+    """Let gates be created as if HO_LOGIC_APP_URL was set."""
+    monkeypatch.setattr(decorator, "HO_LOGIC_APP_CONFIGURED", True)
+
+
+@pytest.fixture
+def answer_approvals(monkeypatch):
+    """
+    Answer approval requests with a fixed decision instead of calling the Logic App.
+
+    Plain functions replace request_approval and request_approval_async, which
+    is cheaper than patching them with mocks. The installer returns the list of
+    (payload, correlation_id) of the requests sent.
+    """
+    def install(status, approver, before_answer=None):
+        sent = []
+        response_data = {"status": status, "approver": approver}
+
+        def fake_request_approval(payload, log_event, correlation_id):  #pylint: disable=unused-argument
+            sent.append((payload, correlation_id))
+            if before_answer is not None:
+                before_answer()
+            return True, response_data, {"Status": status}
+
+        async def fake_request_approval_async(payload, log_event, correlation_id):
+            return fake_request_approval(payload, log_event, correlation_id)
+
+        monkeypatch.setattr(decorator, "request_approval", fake_request_approval)
+        monkeypatch.setattr(decorator, "request_approval_async", fake_request_approval_async)
+        return sent
+
+    return install
@@ -5,215 +5,436 @@
 Tests for approval.py module in the human_oversight package.
 """
 
-import unittest
+import asyncio
 from unittest.mock import patch, Mock
+
+import orjson
+import pytest
 import requests
 
+from human_oversight import approval
+from human_oversight.constants import ApprovalStatus
 from human_oversight.approval import (
+    cache_approval,
+    clear_approval_cache,
+    create_approval_cache_key,
+    get_cached_approval,
+    has_unserializable_parameters,
+    create_session,
     create_serializable_parameters,
     create_approval_payload,
+    create_payload_template,
+    fill_approval_payload,
     send_approval_request,
+    send_approval_request_async,
     update_log_with_response,
     is_approval_granted,
     format_approval_result_message
 )
 
+AGENT_NAME = "TestAgent"
+ACTION_DESC = "Test Action"
+APPROVER_EMAILS = ["approver@example.com"]
+CORRELATION_ID = "test-correlation-id"
+MOCK_TIMESTAMP = "2025-04-13T12:00:00.000000Z"
+
+
+@pytest.fixture
+def logic_app_url(monkeypatch):
+    """Point approval requests at a test Logic App."""
+    monkeypatch.setattr('human_oversight.approval.HO_LOGIC_APP_URL', 'https://test-logic-app.azurewebsites.net')
+
+
+@pytest.fixture
+def log_event():
+    """A base log event for testing."""
+    return {
+        "PartitionKey": AGENT_NAME,
+        "RowKey": CORRELATION_ID,
+        "Status": "Initiated",
+        "Timestamp": MOCK_TIMESTAMP,
+        "ActionDescription": ACTION_DESC
+    }
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_create_approval_payload():
+    """Test creation of approval payload."""
+    parameters = {"user_id": "123", "action": "delete"}
+    payload = create_approval_payload(AGENT_NAME, ACTION_DESC, parameters, APPROVER_EMAILS, CORRELATION_ID)
+
+    assert payload["agentName"] == AGENT_NAME
+    assert payload["actionDescription"] == ACTION_DESC
+    assert payload["parameters"] == parameters
+    assert payload["approverEmails"] == APPROVER_EMAILS
+    assert payload["correlationId"] == CORRELATION_ID
+    assert payload["timestamp"] == MOCK_TIMESTAMP
+
+
+def test_fill_approval_payload_keeps_template():
+    """Test that payloads built from a template do not modify the template."""
+    template = create_payload_template(AGENT_NAME, ACTION_DESC, APPROVER_EMAILS)
+
+    first = fill_approval_payload(template, {"user_id": "1"}, "id-1", MOCK_TIMESTAMP)
+    second = fill_approval_payload(template, {"user_id": "2"}, "id-2", MOCK_TIMESTAMP)
+
+    assert first["parameters"] == {"user_id": "1"}
+    assert second["parameters"] == {"user_id": "2"}
+    assert second["correlationId"] == "id-2"
+    assert second["agentName"] == AGENT_NAME
+    assert "parameters" not in template
+    assert "correlationId" not in template
+
+    first["approverEmails"].append("other@example.com")
+    assert second["approverEmails"] == APPROVER_EMAILS
+    assert template["approverEmails"] == APPROVER_EMAILS
+
+
+def test_create_serializable_parameters():
+    """Test parameter serialization for JSON compatibility."""
+    # Simple serializable parameters
+    kwargs = {"id": 123, "name": "Test Name", "enabled": True}
+    result = create_serializable_parameters(kwargs)
+    assert result == kwargs
+
+    # Test with non-serializable objects
+    class NonSerializable:  #pylint: disable=missing-class-docstring
+        pass
+
+    kwargs_with_complex = {
+        "id": 123,
+        "obj": NonSerializable(),
+        "function": lambda x: x
+    }
+
+    result = create_serializable_parameters(kwargs_with_complex)
+    assert result["id"] == 123
+    assert "<unserializable:" in result["obj"]
+    assert "<unserializable:" in result["function"]
+
+    # Containers are probed as a whole
+    kwargs_with_containers = {
+        "ids": [1, 2, 3],
+        "options": {"force": True},
+        "objects": [NonSerializable()]
+    }
+
+    result = create_serializable_parameters(kwargs_with_containers)
+    assert result["ids"] == [1, 2, 3]
+    assert result["options"] == {"force": True}
+    assert result["objects"] == "<unserializable: list>"
+
+
+@patch('human_oversight.approval.orjson.dumps')
+def test_create_serializable_parameters_skips_probe_for_scalars(mock_dumps):
+    """Test that scalar values are not serialized to check them."""
+    kwargs = {"id": 123, "name": "Test Name", "ratio": 0.5, "enabled": True, "note": None}
+
+    result = create_serializable_parameters(kwargs)
+
+    assert result == kwargs
+    mock_dumps.assert_not_called()
+
+
+def test_create_serializable_parameters_non_str_keys():
+    """Test that dicts with non-string keys are kept, as the stdlib json module did."""
+    kwargs = {"labels": {1: "a", 2: "b"}, "nested": [{3: "c"}]}
+
+    result = create_serializable_parameters(kwargs)
+
+    assert result == kwargs
+    assert create_approval_cache_key(AGENT_NAME, ACTION_DESC, APPROVER_EMAILS, result)
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_non_str_keys(mock_post):
+    """Test that parameters with non-string dict keys are sent with string keys."""
+    mock_response = Mock()
+    mock_response.content = b'{"status": "Approved", "approver": "approver@example.com"}'
+    mock_post.return_value = mock_response
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID, "parameters": {"labels": {1: "a"}}}
+    request_status, _ = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.RECEIVED
+    assert orjson.loads(mock_post.call_args[1]['data'])["parameters"] == {"labels": {"1": "a"}}
+
+
+def test_create_serializable_parameters_large_int():
+    """Test that ints orjson cannot serialize are masked instead of passed through."""
+    kwargs = {"small": -2**63, "large": 2**64 - 1, "huge": 2**70, "huge_list": [2**70]}
+
+    result = create_serializable_parameters(kwargs)
+
+    assert result["small"] == -2**63
+    assert result["large"] == 2**64 - 1
+    assert result["huge"] == "<unserializable: int>"
+    assert result["huge_list"] == "<unserializable: list>"
+    orjson.dumps(result)
+
+
+@patch('human_oversight.approval.orjson.dumps', side_effect=ValueError("probe bug"))
+def test_create_serializable_parameters_only_handles_encode_errors(mock_dumps):
+    """Test that failures other than orjson.JSONEncodeError are not swallowed."""
+    with pytest.raises(ValueError):
+        create_serializable_parameters({"ids": [1, 2, 3]})
+    mock_dumps.assert_called_once()
+
+
+@patch('human_oversight.approval.orjson.dumps', wraps=orjson.dumps)
+def test_create_serializable_parameters_single_probe(mock_dumps):
+    """Test that serializable containers are probed with a single serialization."""
+    kwargs = {"id": 123, "ids": [1, 2, 3], "options": {"force": True}}
+
+    result = create_serializable_parameters(kwargs)
+
+    assert result == kwargs
+    assert result is not kwargs
+    mock_dumps.assert_called_once()
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_success(mock_post):
+    """Test successful approval request transmission."""
+    mock_response = Mock()
+    mock_response.content = b'{"status": "Approved", "approver": "approver@example.com"}'
+    mock_response.raise_for_status = Mock()
+    mock_post.return_value = mock_response
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = send_approval_request(payload)
+
+    # Check that the post was called with the correct URL from our patch
+    assert mock_post.call_args[0][0] == 'https://test-logic-app.azurewebsites.net'
+    assert orjson.loads(mock_post.call_args[1]['data']) == payload
+    assert mock_post.call_args[1]['headers']['Content-Type'] == 'application/json'
+    assert mock_post.call_args[1]['timeout'] == 120
+
+    assert request_status is ApprovalStatus.RECEIVED
+    assert response_data["status"] == "Approved"
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_async(mock_post):
+    """Test the asynchronous approval request uses the shared session."""
+    mock_response = Mock()
+    mock_response.content = b'{"status": "Rejected", "approver": "approver@example.com"}'
+    mock_response.raise_for_status = Mock()
+    mock_post.return_value = mock_response
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = asyncio.run(send_approval_request_async(payload))
+
+    mock_post.assert_called_once()
+    assert request_status is ApprovalStatus.RECEIVED
+    assert response_data["status"] == "Rejected"
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_timeout(mock_post):
+    """Test approval request with timeout."""
+    mock_post.side_effect = requests.exceptions.Timeout("Request timed out")
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.TIMEOUT
+    assert response_data is None
+
+
+def test_create_session():
+    """Test the shared session keeps connections alive and retries safely."""
+    session = create_session()
+    adapter = session.get_adapter('https://test-logic-app.azurewebsites.net')
+
+    assert session.headers["Connection"] == "keep-alive"
+    assert adapter.max_retries.total == 2
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_update_log_with_response_approved(log_event):
+    """Test log update with approval response."""
+    response_data = {"status": "Approved", "approver": "approver@example.com"}
+    updated_log = update_log_with_response(log_event, ApprovalStatus.RECEIVED, response_data)
+
+    assert updated_log["Status"] == "Approved"
+    assert updated_log["Approver"] == "approver@example.com"
+    assert updated_log["CompletionTimestamp"] == MOCK_TIMESTAMP
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_update_log_with_response_rejected(log_event):
+    """Test log update with rejection response."""
+    response_data = {"status": "Rejected", "approver": "admin@example.com"}
+    updated_log = update_log_with_response(log_event, ApprovalStatus.RECEIVED, response_data)
+
+    assert updated_log["Status"] == "Rejected"
+    assert updated_log["Approver"] == "admin@example.com"
+    assert updated_log["CompletionTimestamp"] == MOCK_TIMESTAMP
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_update_log_with_response_timeout(log_event):
+    """Test log update when the approval request timed out."""
+    updated_log = update_log_with_response(log_event, ApprovalStatus.TIMEOUT, None)
+
+    assert updated_log["Status"] == "Timeout"
+    assert updated_log["CompletionTimestamp"] == MOCK_TIMESTAMP
+    assert "Error" not in updated_log
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_update_log_with_response_error(log_event):
+    """Test log update when the approval request failed."""
+    updated_log = update_log_with_response(log_event, ApprovalStatus.ERROR, None)
+
+    assert updated_log["Status"] == "Error"
+    assert updated_log["CompletionTimestamp"] == MOCK_TIMESTAMP
+    assert updated_log["Error"] == "HTTP request failed"
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_request_exception(mock_post):
+    """Test approval request with a generic RequestException."""
+    mock_post.side_effect = requests.exceptions.RequestException("Connection error")
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.ERROR
+    assert response_data is None
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_invalid_json(mock_post):
+    """Test approval request when the Logic App returns a non-JSON body."""
+    mock_response = Mock()
+    mock_response.content = b'<html>Bad Gateway</html>'
+    mock_response.raise_for_status = Mock()
+    mock_post.return_value = mock_response
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.ERROR
+    assert response_data is None
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_non_object_json(mock_post):
+    """Test approval request when the Logic App returns JSON that is not an object."""
+    mock_response = Mock()
+    mock_response.content = b'["Approved"]'
+    mock_response.raise_for_status = Mock()
+    mock_post.return_value = mock_response
+
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID}
+    request_status, response_data = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.ERROR
+    assert response_data is None
+
+
+@pytest.mark.usefixtures("logic_app_url")
+@patch('human_oversight.approval._SESSION.post')
+def test_send_approval_request_unserializable_payload(mock_post):
+    """Test that a payload orjson cannot serialize is reported as an error."""
+    payload = {"agentName": AGENT_NAME, "correlationId": CORRELATION_ID, "parameters": {"obj": object()}}
+    request_status, response_data = send_approval_request(payload)
+
+    assert request_status is ApprovalStatus.ERROR
+    assert response_data is None
+    mock_post.assert_not_called()
+
+
+def test_create_approval_cache_key():
+    """Test that cache keys identify requests independent of parameter order."""
+    key = create_approval_cache_key(AGENT_NAME, ACTION_DESC, APPROVER_EMAILS, {"a": 1, "b": 2})
+
+    assert key == create_approval_cache_key(AGENT_NAME, ACTION_DESC, APPROVER_EMAILS, {"b": 2, "a": 1})
+    assert key != create_approval_cache_key(AGENT_NAME, ACTION_DESC, APPROVER_EMAILS, {"a": 1, "b": 3})
+    assert key != create_approval_cache_key(AGENT_NAME, "Other Action", APPROVER_EMAILS, {"a": 1, "b": 2})
+
+
+def test_has_unserializable_parameters():
+    """Test detecting parameters that had to be masked."""
+    assert not has_unserializable_parameters(create_serializable_parameters({"id": 1, "ids": [1, 2]}))
+    assert has_unserializable_parameters(create_serializable_parameters({"id": 1, "obj": object()}))
+
+
+@patch('human_oversight.approval.time.monotonic')
+def test_cached_approval_expires(mock_monotonic):
+    """Test that cached approvals are only returned until their TTL passes."""
+    clear_approval_cache()
+    response_data = {"status": "Approved", "approver": "approver@example.com"}
+
+    mock_monotonic.return_value = 1000.0
+    cache_approval("key", response_data, 60)
+
+    mock_monotonic.return_value = 1059.0
+    assert get_cached_approval("key") == response_data
+
+    mock_monotonic.return_value = 1060.0
+    assert get_cached_approval("key") is None
+    assert get_cached_approval("unknown-key") is None
+
+
+@patch('human_oversight.approval.APPROVAL_CACHE_MAX_ENTRIES', 2)
+@patch('human_oversight.approval.time.monotonic')
+def test_approval_cache_is_bounded(mock_monotonic):
+    """Test that caching drops expired approvals and evicts the oldest one when full."""
+    clear_approval_cache()
+    response_data = {"status": "Approved", "approver": "approver@example.com"}
+
+    mock_monotonic.return_value = 1000.0
+    cache_approval("first", response_data, 60)
+    cache_approval("short", response_data, 10)
+
+    mock_monotonic.return_value = 1010.0
+    cache_approval("second", response_data, 60)
+    assert list(approval._APPROVAL_CACHE) == ["first", "second"]
+
+    cache_approval("third", response_data, 60)
+
+    assert list(approval._APPROVAL_CACHE) == ["second", "third"]
+    assert get_cached_approval("first") is None
+    assert get_cached_approval("third") == response_data
+
+
+def test_is_approval_granted():
+    """Test approval status checking."""
+    assert is_approval_granted({"status": "Approved"})
+    assert not is_approval_granted({"status": "Rejected"})
+    assert not is_approval_granted({"status": "Pending"})
+    assert not is_approval_granted({})
+
+
+def test_format_approval_result_message():
+    """Test formatting of approval result messages."""
+    # Test approved message
+    approved_data = {"status": "Approved", "approver": "approver@example.com"}
+    approved_msg = format_approval_result_message(approved_data, CORRELATION_ID)
+    assert "Approval received" in approved_msg
+    assert CORRELATION_ID in approved_msg
+    assert "approver@example.com" in approved_msg
+
+    # Test rejected message
+    rejected_data = {"status": "Rejected", "approver": "approver@example.com"}
+    rejected_msg = format_approval_result_message(rejected_data, CORRELATION_ID)
+    assert "rejected" in rejected_msg
+    assert CORRELATION_ID in rejected_msg
+    assert "approver@example.com" in rejected_msg
 
-class TestApprovalFunctions(unittest.TestCase):
-    """Test approval request and response handling functions."""
-
-    def setUp(self):
-        self.agent_name = "TestAgent"
-        self.action_desc = "Test Action"
-        self.approver_emails = ["approver@example.com"]
-        self.correlation_id = "test-correlation-id"
-        self.mock_timestamp = "2025-04-13T12:00:00.000000Z"
-
-        # Create a base log event for testing
-        self.log_event = {
-            "PartitionKey": self.agent_name,
-            "RowKey": self.correlation_id,
-            "Status": "Initiated",
-            "Timestamp": self.mock_timestamp,
-            "ActionDescription": self.action_desc
-        }
-
-    @patch('human_oversight.approval.get_current_timestamp')
-    def test_create_approval_payload(self, mock_timestamp):
-        """Test creation of approval payload."""
-        mock_timestamp.return_value = self.mock_timestamp
-
-        parameters = {"user_id": "123", "action": "delete"}
-        payload = create_approval_payload(
-            self.agent_name,
-            self.action_desc,
-            parameters,
-            self.approver_emails,
-            self.correlation_id
-        )
-
-        self.assertEqual(payload["agentName"], self.agent_name)
-        self.assertEqual(payload["actionDescription"], self.action_desc)
-        self.assertEqual(payload["parameters"], parameters)
-        self.assertEqual(payload["approverEmails"], self.approver_emails)
-        self.assertEqual(payload["correlationId"], self.correlation_id)
-        self.assertEqual(payload["timestamp"], self.mock_timestamp)
-
-    def test_create_serializable_parameters(self):
-        """Test parameter serialization for JSON compatibility."""
-        # Simple serializable parameters
-        kwargs = {"id": 123, "name": "Test Name", "enabled": True}
-        result = create_serializable_parameters(kwargs)
-        self.assertEqual(result, kwargs)
-
-        # Test with non-serializable objects
-        class NonSerializable:  #pylint: disable=missing-class-docstring
-            pass
-
-        kwargs_with_complex = {
-            "id": 123,
-            "obj": NonSerializable(),
-            "function": lambda x: x
-        }
-
-        result = create_serializable_parameters(kwargs_with_complex)
-        self.assertEqual(result["id"], 123)
-        self.assertIn("<unserializable:", result["obj"])
-        self.assertIn("<unserializable:", result["function"])
-
-    @patch('human_oversight.approval.HO_LOGIC_APP_URL', 'https://test-logic-app.azurewebsites.net')
-    @patch('requests.post')
-    def test_send_approval_request_success(self, mock_post):
-        """Test successful approval request transmission."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"status": "Approved", "approver": "approver@example.com"}
-        mock_response.raise_for_status = Mock()
-        mock_post.return_value = mock_response
-
-        payload = {"agentName": self.agent_name, "correlationId": self.correlation_id}
-        success, response_data = send_approval_request(payload)
-
-        # Check that the post was called with the correct URL from our patch
-        self.assertEqual(mock_post.call_args[0][0], 'https://test-logic-app.azurewebsites.net')
-        self.assertEqual(mock_post.call_args[1]['json'], payload)
-        self.assertEqual(mock_post.call_args[1]['timeout'], 120)
-
-        self.assertTrue(success)
-        self.assertEqual(response_data["status"], "Approved")
-
-    @patch('human_oversight.approval.HO_LOGIC_APP_URL', 'https://test-logic-app.azurewebsites.net')
-    @patch('requests.post')
-    def test_send_approval_request_timeout(self, mock_post):
-        """Test approval request with timeout."""
-        mock_post.side_effect = requests.exceptions.Timeout("Request timed out")
-
-        payload = {"agentName": self.agent_name, "correlationId": self.correlation_id}
-        success, response_data = send_approval_request(payload)
-
-        self.assertFalse(success)
-        self.assertIsNone(response_data)
-
-    @patch('human_oversight.approval.get_current_timestamp')
-    def test_update_log_with_response_approved(self, mock_timestamp):
-        """Test log update with approval response."""
-        mock_timestamp.return_value = self.mock_timestamp
-
-        response_data = {"status": "Approved", "approver": "approver@example.com"}
-        updated_log = update_log_with_response(self.log_event, True, response_data)
-
-        self.assertEqual(updated_log["Status"], "Approved")
-        self.assertEqual(updated_log["Approver"], "approver@example.com")
-        self.assertEqual(updated_log["CompletionTimestamp"], self.mock_timestamp)
-
-    @patch('human_oversight.approval.get_current_timestamp')
-    def test_update_log_with_response_rejected(self, mock_timestamp):
-        """Test log update with rejection response."""
-        mock_timestamp.return_value = self.mock_timestamp
-
-        response_data = {"status": "Rejected", "approver": "admin@example.com"}
-        updated_log = update_log_with_response(self.log_event, True, response_data)
-
-        self.assertEqual(updated_log["Status"], "Rejected")
-        self.assertEqual(updated_log["Approver"], "admin@example.com")
-        self.assertEqual(updated_log["CompletionTimestamp"], self.mock_timestamp)
-
-    @patch('human_oversight.approval.get_current_timestamp')
-    def test_update_log_with_response_timeout(self, mock_timestamp):
-        """Test log update with timeout response (success=False)."""
-        mock_timestamp.return_value = self.mock_timestamp
-
-        # Simulate a timeout by passing success=False and specific exception type
-        # Note: In the actual send_approval_request, success would be False
-        # Here we simulate the input to update_log_with_response after a timeout
-        # We pass a mock exception object to check if it's handled correctly
-        mock_exception = requests.exceptions.Timeout("Request timed out")  # pylint: disable=unused-variable
-
-        # We need to modify the function signature slightly or how we call it
-        # Let's adjust the test logic: update_log_with_response doesn't directly receive the exception
-        # It receives success=False. The distinction between Timeout and other errors happens before.
-        # So, we test the case where success is False.
-
-        updated_log = update_log_with_response(self.log_event, False, None)
-
-        # Check if status is set to Error (as Timeout isn't directly passed)
-        # The logic in update_log_with_response sets status to TIMEOUT only if success is a Timeout exception instance,
-        # which is not the case here. It sets ERROR for success=False.
-        # Let's refine the test based on the actual implementation.
-
-        # Re-evaluating update_log_with_response:
-        # if not success:
-        #    status = ApprovalStatus.TIMEOUT.value if isinstance(success, requests.exceptions.Timeout) else ApprovalStatus.ERROR.value
-        # The check `isinstance(success, requests.exceptions.Timeout)` will always be False because `success` is a boolean.
-        # This seems like a potential bug in update_log_with_response.
-        # For now, the test will reflect the current behavior (always sets ERROR when success is False).
-
-        self.assertEqual(updated_log["Status"], "Error") # Current behavior
-        # If the bug were fixed, we might expect "Timeout" here if the exception type was passed.
-        self.assertEqual(updated_log["CompletionTimestamp"], self.mock_timestamp)
-        self.assertIn("Error", updated_log) # Check if Error field is added
-        self.assertEqual(updated_log["Error"], "HTTP request failed")
-
-    @patch('human_oversight.approval.HO_LOGIC_APP_URL', 'https://test-logic-app.azurewebsites.net')
-    @patch('requests.post')
-    def test_send_approval_request_request_exception(self, mock_post):
-        """Test approval request with a generic RequestException."""
-        mock_post.side_effect = requests.exceptions.RequestException("Connection error")
-
-        payload = {"agentName": self.agent_name, "correlationId": self.correlation_id}
-        success, response_data = send_approval_request(payload)
-
-        self.assertFalse(success)
-        self.assertIsNone(response_data)
-
-    def test_is_approval_granted(self):
-        """Test approval status checking."""
-        self.assertTrue(is_approval_granted({"status": "Approved"}))
-        self.assertFalse(is_approval_granted({"status": "Rejected"}))
-        self.assertFalse(is_approval_granted({"status": "Pending"}))
-        self.assertFalse(is_approval_granted({}))
-
-    def test_format_approval_result_message(self):
-        """Test formatting of approval result messages."""
-        # Test approved message
-        approved_data = {"status": "Approved", "approver": "approver@example.com"}
-        approved_msg = format_approval_result_message(approved_data, self.correlation_id)
-        self.assertIn("Approval received", approved_msg)
-        self.assertIn(self.correlation_id, approved_msg)
-        self.assertIn("approver@example.com", approved_msg)
-
-        # Test rejected message
-        rejected_data = {"status": "Rejected", "approver": "approver@example.com"}
-        rejected_msg = format_approval_result_message(rejected_data, self.correlation_id)
-        self.assertIn("rejected", rejected_msg)
-        self.assertIn(self.correlation_id, rejected_msg)
-        self.assertIn("approver@example.com", rejected_msg)
-
-        # Test other status
-        other_data = {"status": "Unknown"}
-        other_msg = format_approval_result_message(other_data, self.correlation_id)
-        self.assertIn("timed out or status unclear", other_msg)
-        self.assertIn(self.correlation_id, other_msg)
-
-
-if __name__ == '__main__':
-    unittest.main()
+    # Test other status
+    other_data = {"status": "Unknown"}
+    other_msg = format_approval_result_message(other_data, CORRELATION_ID)
+    assert "timed out or status unclear" in other_msg
+    assert CORRELATION_ID in other_msg
@@ -5,7 +5,6 @@
 Tests for constants.py module in the human_oversight package.
 """
 
-import unittest
 import json
 
 from human_oversight.constants import (
@@ -16,49 +15,47 @@ from human_oversight.constants import (
     STATUS_REJECTED
 )
 
-class TestConstants(unittest.TestCase):
-    """Test constants definitions and enumerations."""
 
-    def test_approval_status_enum(self):
-        """Test the ApprovalStatus enum values."""
-        self.assertEqual(ApprovalStatus.INITIATED, "Initiated")
-        self.assertEqual(ApprovalStatus.APPROVED, "Approved")
-        self.assertEqual(ApprovalStatus.REJECTED, "Rejected")
-        self.assertEqual(ApprovalStatus.TIMEOUT, "Timeout")
-        self.assertEqual(ApprovalStatus.ERROR, "Error")
-        self.assertEqual(ApprovalStatus.EXECUTED, "Executed")
-        self.assertEqual(ApprovalStatus.EXECUTION_FAILED, "ExecutionFailed")
+def test_approval_status_enum():
+    """Test the ApprovalStatus enum values."""
+    assert ApprovalStatus.INITIATED == "Initiated"
+    assert ApprovalStatus.RECEIVED == "Received"
+    assert ApprovalStatus.APPROVED == "Approved"
+    assert ApprovalStatus.REJECTED == "Rejected"
+    assert ApprovalStatus.TIMEOUT == "Timeout"
+    assert ApprovalStatus.ERROR == "Error"
+    assert ApprovalStatus.EXECUTED == "Executed"
+    assert ApprovalStatus.EXECUTION_FAILED == "ExecutionFailed"
 
-    def test_approval_status_aliases(self):
-        """Test the status aliases for backwards compatibility."""
-        self.assertEqual(STATUS_APPROVED, ApprovalStatus.APPROVED)
-        self.assertEqual(STATUS_REJECTED, ApprovalStatus.REJECTED)
 
-    def test_approval_status_serializable(self):
-        """Test that enum values can be serialized to JSON."""
-        status_dict = {
-            "initiated": ApprovalStatus.INITIATED,
-            "approved": ApprovalStatus.APPROVED,
-            "rejected": ApprovalStatus.REJECTED
-        }
+def test_approval_status_aliases():
+    """Test the status aliases for backwards compatibility."""
+    assert STATUS_APPROVED == ApprovalStatus.APPROVED
+    assert STATUS_REJECTED == ApprovalStatus.REJECTED
 
-        # Should not raise any exceptions
-        json_str = json.dumps(status_dict)
 
-        # Verify serialization is correct
-        parsed = json.loads(json_str)
-        self.assertEqual(parsed["initiated"], "Initiated")
-        self.assertEqual(parsed["approved"], "Approved")
-        self.assertEqual(parsed["rejected"], "Rejected")
+def test_approval_status_serializable():
+    """Test that enum values can be serialized to JSON."""
+    status_dict = {
+        "initiated": ApprovalStatus.INITIATED,
+        "approved": ApprovalStatus.APPROVED,
+        "rejected": ApprovalStatus.REJECTED
+    }
 
-    def test_default_values(self):
-        """Test default configuration values."""
-        self.assertIsInstance(TIMEOUT_SECONDS, int)
-        self.assertGreater(TIMEOUT_SECONDS, 0)
+    # Should not raise any exceptions
+    json_str = json.dumps(status_dict)
 
-        self.assertIsInstance(DEFAULT_REFUSAL_VALUE, str)
-        self.assertIn("denied", DEFAULT_REFUSAL_VALUE)
+    # Verify serialization is correct
+    parsed = json.loads(json_str)
+    assert parsed["initiated"] == "Initiated"
+    assert parsed["approved"] == "Approved"
+    assert parsed["rejected"] == "Rejected"
 
 
-if __name__ == '__main__':
-    unittest.main()
+def test_default_values():
+    """Test default configuration values."""
+    assert isinstance(TIMEOUT_SECONDS, int)
+    assert TIMEOUT_SECONDS > 0
+
+    assert isinstance(DEFAULT_REFUSAL_VALUE, str)
+    assert "denied" in DEFAULT_REFUSAL_VALUE
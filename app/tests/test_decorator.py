@@ -5,56 +5,106 @@
 Tests for decorator.py module in the human_oversight package.
 """
 
-import unittest
-from unittest.mock import patch
-from human_oversight.decorator import validate_configuration, execute_function_with_logging
+import pytest
+
+from human_oversight.decorator import (
+    create_parameter_binder,
+    create_request_builder,
+    execute_function_with_logging,
+    validate_configuration
+)
 from human_oversight.constants import ApprovalStatus
 
-class TestDecorator(unittest.TestCase):
-    """Test the decorator module."""
-
-    @patch('human_oversight.decorator.HO_LOGIC_APP_URL', None)
-    def test_validate_configuration_missing_url(self):
-        """Test that validate_configuration raises an error when HO_LOGIC_APP_URL is not set."""
-        with self.assertRaises(ValueError) as context:
-            validate_configuration()
-        self.assertIn("HO_LOGIC_APP_URL environment variable must be set", str(context.exception))
-
-    @patch('human_oversight.logging_utils.get_current_timestamp', return_value="2025-04-13T12:00:00.000000Z")
-    @patch('human_oversight.decorator.log_approval_event')
-    def test_execute_function_with_logging_success(self, mock_log_event, mock_timestamp):
-        """Test successful function execution with logging."""
-        def sample_function(x):  #pylint: disable=invalid-name
-            return x * 2
-
-        log_event = {
-            "Status": ApprovalStatus.INITIATED,
-            "ExecutionTimestamp": None
-        }
-        result = execute_function_with_logging(sample_function, (5,), {}, log_event, "test-correlation-id")
-
-        self.assertEqual(result, 10)
-        self.assertEqual(log_event["Status"], ApprovalStatus.EXECUTED)
-        mock_log_event.assert_called_once()
-
-    @patch('human_oversight.logging_utils.get_current_timestamp', return_value="2025-04-13T12:00:00.000000Z")
-    @patch('human_oversight.decorator.log_approval_event')
-    def test_execute_function_with_logging_failure(self, mock_log_event, mock_timestamp):
-        """Test failed function execution with logging."""
-        def sample_function(x):  #pylint: disable=invalid-name
-            raise ValueError("Test error")
-
-        log_event = {
-            "Status": ApprovalStatus.INITIATED,
-            "ExecutionTimestamp": None
-        }
-
-        with self.assertRaises(ValueError):
+
+def test_validate_configuration_missing_url(monkeypatch):
+    """Test that validate_configuration raises an error when HO_LOGIC_APP_URL is not set."""
+    monkeypatch.setattr('human_oversight.decorator.HO_LOGIC_APP_CONFIGURED', False)
+    with pytest.raises(ValueError) as context:
+        validate_configuration()
+    assert "HO_LOGIC_APP_URL environment variable must be set" in str(context.value)
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_execute_function_with_logging_success(mock_log_event):
+    """Test successful function execution with logging."""
+    def sample_function(x):  #pylint: disable=invalid-name
+        return x * 2
+
+    log_event = {
+        "Status": ApprovalStatus.INITIATED,
+        "ExecutionTimestamp": None
+    }
+    result = execute_function_with_logging(sample_function, (5,), {}, log_event, "test-correlation-id")
+
+    assert result == 10
+    assert log_event["Status"] == ApprovalStatus.EXECUTED
+    mock_log_event.assert_called_once()
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_execute_function_with_logging_failure(mock_log_event, caplog):
+    """Test failed function execution with logging."""
+    def sample_function(x):  #pylint: disable=invalid-name
+        raise ValueError("Test error")
+
+    log_event = {
+        "Status": ApprovalStatus.INITIATED,
+        "ExecutionTimestamp": None
+    }
+
+    with caplog.at_level("ERROR", logger='human_oversight.decorator'):
+        with pytest.raises(ValueError):
             execute_function_with_logging(sample_function, (5,), {}, log_event, "test-correlation-id")
 
-        self.assertEqual(log_event["Status"], ApprovalStatus.EXECUTION_FAILED)
-        self.assertIn("Error", log_event)
-        mock_log_event.assert_called_once()
+    assert log_event["Status"] == ApprovalStatus.EXECUTION_FAILED
+    assert log_event["Error"] == "Test error"
+    assert caplog.records[0].exc_info[0] is ValueError
+    mock_log_event.assert_called_once()
+
+
+def test_create_parameter_binder():
+    """Test binding call arguments to parameter names."""
+    def sample_function(user_id, force=False, *, reason=None):  #pylint: disable=unused-argument
+        pass
+
+    bind_parameters = create_parameter_binder(sample_function)
+
+    assert bind_parameters(("1",), {}) == {"user_id": "1"}
+    assert bind_parameters(("1", True), {"reason": "cleanup"}) == {"user_id": "1", "force": True, "reason": "cleanup"}
+
+
+def test_create_parameter_binder_var_positional():
+    """Test binding extra positional arguments collected by *args."""
+    def sample_function(a, *args, **kwargs):  #pylint: disable=unused-argument
+        pass
+
+    bind_parameters = create_parameter_binder(sample_function)
+
+    assert bind_parameters((1, 2, 3), {"option": "x"}) == {"a": 1, "arg1": 2, "arg2": 3, "option": "x"}
+
+
+def test_create_parameter_binder_positional_unserializable():
+    """Test that unserializable positional arguments are replaced like keyword arguments."""
+    def sample_function(client, user_id):  #pylint: disable=unused-argument
+        pass
+
+    bind_parameters = create_parameter_binder(sample_function)
+
+    assert bind_parameters((object(), "1"), {}) == {"client": "<unserializable: object>", "user_id": "1"}
+
+
+def test_create_request_builder_shares_parameters(mock_log_event):
+    """Test that the log event and the payload share one parameters dict."""
+    def sample_function(user_id, items):  #pylint: disable=unused-argument
+        pass
+
+    build_request = create_request_builder(
+        sample_function, "TestAgent", "Test Action", ["approver@example.com"]
+    )
+    correlation_id, payload, log_event = build_request(("1", [1, 2]), {})
 
-if __name__ == '__main__':
-    unittest.main()
+    assert log_event["Parameters"] is payload["parameters"]
+    assert payload["parameters"] == {"user_id": "1", "items": [1, 2]}
+    assert log_event["RowKey"] == correlation_id
+    assert log_event["Timestamp"] == payload["timestamp"]
+    mock_log_event.assert_called_once_with(log_event)
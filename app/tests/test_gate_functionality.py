@@ -3,170 +3,347 @@
 
 """
 Tests for gate functionality.
+
+These tests focus on the gate behavior rather than the internal
+implementation details.
 """
 
-import unittest
-from unittest.mock import patch
-import logging
+import asyncio
+import re
+import threading
+import time
+
+import pytest
 
-from human_oversight import approval_gate
+from human_oversight import approval_gate, approval_gate_async, check_approval, decorator
+from human_oversight.approval import clear_approval_cache
 from human_oversight.constants import DEFAULT_REFUSAL_VALUE
 
 
-# Configure logging for tests
-logging.basicConfig(level=logging.INFO)
+AGENT_NAME = "SecurityAgent"
+ACTION_DESC = "Format Hard Drive"
+APPROVER_EMAILS = ["security@example.com", "admin@example.com"]
 
+# Every gate in this module is created as if HO_LOGIC_APP_URL was set
+pytestmark = pytest.mark.usefixtures("logic_app_configured")
 
-class TestApprovalGateFunctionality(unittest.TestCase):
-    """
-    Test the approval_gate decorator behavior under different conditions.
-    
-    These tests focus on the gate behavior rather than the internal 
-    implementation details.
-    """
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.agent_name = "SecurityAgent"
-        self.action_desc = "Format Hard Drive"
-        self.approver_emails = ["security@example.com", "admin@example.com"]
+@pytest.fixture(autouse=True)
+def empty_approval_cache():
+    """Start every test without cached approvals."""
+    clear_approval_cache()
 
-        # Counter for function calls
-        self.call_count = 0
 
-        # Simple function to be decorated
-        def critical_operation(resource_id, confirm=False):
-            self.call_count += 1
-            return f"Performed critical operation on {resource_id} (confirm={confirm})"
+@pytest.fixture
+def critical_operation():
+    """Simple function to be decorated, counting its calls in `call_count`."""
+    def operation(resource_id, confirm=False):
+        operation.call_count += 1
+        return f"Performed critical operation on {resource_id} (confirm={confirm})"
 
-        self.critical_operation = critical_operation
+    operation.call_count = 0
+    return operation
 
-    @patch('human_oversight.decorator.HO_LOGIC_APP_URL', 'https://test-gate.example.com')
-    @patch('human_oversight.decorator.request_approval')
-    def test_approved_operation_executes(self, mock_request):
-        """Test that operations are executed when approved."""
-        # Mock approved response
-        mock_request.return_value = (
-            True,
-            {"status": "Approved", "approver": "security@example.com"},
-            {"Status": "Approved"}
-        )
 
-        # Create decorated function
-        secured_operation = approval_gate(
-            agent_name=self.agent_name,
-            action_description=self.action_desc,
-            approver_emails=self.approver_emails
-        )(self.critical_operation)
-
-        # Call with test parameters
-        result = secured_operation("server-001", confirm=True)
-
-        # Verify function was executed
-        self.assertEqual(self.call_count, 1)
-        self.assertIn("Performed critical operation", result)
-        self.assertIn("server-001", result)
-
-    @patch('human_oversight.decorator.HO_LOGIC_APP_URL', 'https://test-gate.example.com')
-    @patch('human_oversight.decorator.request_approval')
-    def test_rejected_operation_blocked(self, mock_request):
-        """Test that operations are blocked when rejected."""
-        # Mock rejected response
-        mock_request.return_value = (
-            True,
-            {"status": "Rejected", "approver": "admin@example.com"},
-            {"Status": "Rejected"}
-        )
+@pytest.fixture
+def async_critical_operation():
+    """Simple coroutine function to be decorated, counting its calls in `call_count`."""
+    async def operation(resource_id, confirm=False):
+        operation.call_count += 1
+        return f"Performed critical operation on {resource_id} (confirm={confirm})"
 
-        # Custom refusal message
-        refusal_msg = "Security policy violation: operation rejected"
-
-        # Create decorated function
-        secured_operation = approval_gate(
-            agent_name=self.agent_name,
-            action_description=self.action_desc,
-            approver_emails=self.approver_emails,
-            refusal_return_value=refusal_msg
-        )(self.critical_operation)
-
-        # Call with test parameters
-        result = secured_operation("database-prod", confirm=True)
-
-        # Verify function was NOT executed
-        self.assertEqual(self.call_count, 0)
-        self.assertEqual(result, refusal_msg)
-
-    @patch('human_oversight.decorator.HO_LOGIC_APP_URL', 'https://test-gate.example.com')
-    @patch('human_oversight.decorator.request_approval')
-    def test_default_refusal_value(self, mock_request):
-        """Test the default refusal value is returned when not overridden."""
-        # Mock rejected response
-        mock_request.return_value = (
-            True,
-            {"status": "Rejected", "approver": "admin@example.com"},
-            {"Status": "Rejected"}
-        )
+    operation.call_count = 0
+    return operation
+
+
+@pytest.mark.parametrize("status, gate_options, expected_calls, expected_result", [
+    # Approved operations are executed
+    ("Approved", {}, 1, "Performed critical operation on server-001 (confirm=True)"),
+    # Rejected operations return the custom refusal message
+    ("Rejected", {"refusal_return_value": "Security policy violation: operation rejected"},
+     0, "Security policy violation: operation rejected"),
+    # Rejected operations return the default refusal value when not overridden
+    ("Rejected", {}, 0, DEFAULT_REFUSAL_VALUE),
+], ids=["approved", "rejected", "default-refusal"])
+def test_gate_decision(answer_approvals, critical_operation, status, gate_options,
+                       expected_calls, expected_result):
+    """Test that the approver's decision controls whether the operation runs."""
+    answer_approvals(status, "security@example.com")
+
+    # Create decorated function
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        **gate_options
+    )(critical_operation)
+
+    # Call with test parameters
+    result = secured_operation("server-001", confirm=True)
+
+    assert critical_operation.call_count == expected_calls
+    assert result == expected_result
+
+
+def test_complex_function_signature(answer_approvals):
+    """Test that approval gate works with complex function signatures."""
+    # Answer with an approval
+    sent = answer_approvals("Approved", "security@example.com")
+    calls = []
+
+    # Function with complex signature
+    def complex_function(a, b, *args, c=None, **kwargs):  #pylint: disable=invalid-name
+        calls.append(a)
+        return {
+            "a": a,
+            "b": b,
+            "args": args,
+            "c": c,
+            "kwargs": kwargs
+        }
+
+    # Create decorated function
+    secured_complex = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS
+    )(complex_function)
+
+    # Call with variety of parameters
+    result = secured_complex(
+        1, "text", "extra1", "extra2",
+        c="override",
+        option1=True,
+        option2="value"
+    )
+
+    # Verify function was executed with all parameters
+    assert len(calls) == 1
+    assert result["a"] == 1
+    assert result["b"] == "text"
+    assert result["args"] == ("extra1", "extra2")
+    assert result["c"] == "override"
+    assert result["kwargs"]["option1"] is True
+    assert result["kwargs"]["option2"] == "value"
+
+    # Verify the request is tracked with a random hex correlation ID
+    payload, correlation_id = sent[0]
+    assert re.fullmatch(r"[0-9a-f]{32}", payload["correlationId"])
+    assert correlation_id == payload["correlationId"]
+
+    # Verify positional args beyond the named parameters are keyed by index
+    assert payload["parameters"] == {
+        "a": 1,
+        "b": "text",
+        "arg2": "extra1",
+        "arg3": "extra2",
+        "c": "override",
+        "option1": True,
+        "option2": "value"
+    }
+
+
+def test_cacheable_approval_is_reused(answer_approvals, critical_operation):
+    """Test that a cacheable gate reuses a granted approval for identical calls."""
+    sent = answer_approvals("Approved", "security@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        cacheable=True
+    )(critical_operation)
+
+    secured_operation("server-001", confirm=True)
+    secured_operation("server-001", confirm=True)
+    secured_operation("server-002", confirm=True)
+
+    # The repeated call reuses the approval, the different resource does not
+    assert critical_operation.call_count == 3
+    assert len(sent) == 2
+
+
+def test_unserializable_arguments_not_cached(answer_approvals, critical_operation):
+    """Test that approvals for masked, unserializable arguments are never reused."""
+    sent = answer_approvals("Approved", "security@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        cacheable=True
+    )(critical_operation)
+
+    # Both objects are sent as "<unserializable: object>", but they differ
+    secured_operation(object())
+    secured_operation(object())
+
+    assert critical_operation.call_count == 2
+    assert len(sent) == 2
+
+
+def test_approval_not_cached_by_default(answer_approvals, critical_operation):
+    """Test that gates request a new approval for every call unless cacheable."""
+    sent = answer_approvals("Approved", "security@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS
+    )(critical_operation)
+
+    secured_operation("server-001", confirm=True)
+    secured_operation("server-001", confirm=True)
+
+    assert critical_operation.call_count == 2
+    assert len(sent) == 2
 
-        # Create decorated function with default refusal value
-        secured_operation = approval_gate(
-            agent_name=self.agent_name,
-            action_description=self.action_desc,
-            approver_emails=self.approver_emails
-        )(self.critical_operation)
-
-        # Call with test parameters
-        result = secured_operation("database-prod", confirm=True)
-
-        # Verify default refusal value is returned
-        self.assertEqual(self.call_count, 0)
-        self.assertEqual(result, DEFAULT_REFUSAL_VALUE)
-
-    @patch('human_oversight.decorator.HO_LOGIC_APP_URL', 'https://test-gate.example.com')
-    @patch('human_oversight.decorator.request_approval')
-    def test_complex_function_signature(self, mock_request):
-        """Test that approval gate works with complex function signatures."""
-        # Mock approved response
-        mock_request.return_value = (
-            True,
-            {"status": "Approved", "approver": "security@example.com"},
-            {"Status": "Approved"}
-        )
 
-        # Function with complex signature
-        def complex_function(a, b, *args, c=None, **kwargs):  #pylint: disable=invalid-name
-            self.call_count += 1
-            return {
-                "a": a,
-                "b": b,
-                "args": args,
-                "c": c,
-                "kwargs": kwargs
-            }
-
-        # Create decorated function
-        secured_complex = approval_gate(
-            agent_name=self.agent_name,
-            action_description=self.action_desc,
-            approver_emails=self.approver_emails
-        )(complex_function)
-
-        # Call with variety of parameters
-        result = secured_complex(
-            1, "text", "extra1", "extra2",
-            c="override",
-            option1=True,
-            option2="value"
+def test_rejection_not_cached(answer_approvals, critical_operation):
+    """Test that a rejection is never reused, even for cacheable gates."""
+    sent = answer_approvals("Rejected", "admin@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        cacheable=True
+    )(critical_operation)
+
+    secured_operation("server-001")
+    secured_operation("server-001")
+
+    assert critical_operation.call_count == 0
+    assert len(sent) == 2
+
+
+def wait_for_deferred_result(handle):
+    """Poll check_approval until the deferred call has finished."""
+    for _ in range(500):
+        done, result = check_approval(handle)
+        if done:
+            return result
+        time.sleep(0.01)
+    pytest.fail("Deferred gated call did not finish")
+
+
+def test_deferred_approval_returns_handle(answer_approvals, critical_operation):
+    """Test that deferred calls return a handle and execute once approved."""
+    approval_sent = threading.Event()
+    answer_approvals("Approved", "security@example.com", before_answer=lambda: approval_sent.wait(5))
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        defer_approval=True
+    )(critical_operation)
+
+    pending = secured_operation("server-001", confirm=True)
+
+    assert pending["status"] == "Pending"
+    assert check_approval(pending["handle"]) == (False, None)
+    assert critical_operation.call_count == 0
+
+    approval_sent.set()
+    result = wait_for_deferred_result(pending["handle"])
+
+    assert critical_operation.call_count == 1
+    assert "server-001" in result
+    # A finished call is forgotten once its result was returned
+    with pytest.raises(KeyError):
+        check_approval(pending["handle"])
+
+
+def test_deferred_rejection_returns_refusal_value(answer_approvals, critical_operation):
+    """Test that a rejected deferred call reports the refusal value."""
+    answer_approvals("Rejected", "security@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        refusal_return_value="REJECTED",
+        defer_approval=True
+    )(critical_operation)
+
+    pending = secured_operation("server-001")
+
+    assert wait_for_deferred_result(pending["handle"]) == "REJECTED"
+    assert critical_operation.call_count == 0
+
+
+def test_uncollected_deferred_result_expires(answer_approvals, critical_operation, monkeypatch):
+    """Test that finished deferred calls are forgotten when their result is not collected in time."""
+    monkeypatch.setattr(decorator, "DEFERRED_RESULT_TTL_SECONDS", 0)
+    answer_approvals("Approved", "security@example.com")
+
+    secured_operation = approval_gate(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS,
+        defer_approval=True
+    )(critical_operation)
+
+    handle = secured_operation("server-001")["handle"]
+    for _ in range(500):
+        if handle in decorator._FINISHED_DEFERRED_CALLS:  #pylint: disable=protected-access
+            break
+        time.sleep(0.01)
+
+    with pytest.raises(KeyError):
+        check_approval(handle)
+    assert handle not in decorator._DEFERRED_CALLS  #pylint: disable=protected-access
+
+
+def test_approved_coroutines_execute_concurrently(answer_approvals, async_critical_operation):
+    """Test that several approved coroutines can be awaited together."""
+    sent = answer_approvals("Approved", "security@example.com")
+
+    secured_operation = approval_gate_async(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS
+    )(async_critical_operation)
+
+    async def run_all():
+        return await asyncio.gather(
+            secured_operation("server-001", confirm=True),
+            secured_operation("server-002")
         )
 
-        # Verify function was executed with all parameters
-        self.assertEqual(self.call_count, 1)
-        self.assertEqual(result["a"], 1)
-        self.assertEqual(result["b"], "text")
-        self.assertEqual(result["args"], ("extra1", "extra2"))
-        self.assertEqual(result["c"], "override")
-        self.assertEqual(result["kwargs"]["option1"], True)
-        self.assertEqual(result["kwargs"]["option2"], "value")
+    results = asyncio.run(run_all())
+
+    assert async_critical_operation.call_count == 2
+    assert "server-001" in results[0]
+    assert "server-002" in results[1]
+    assert len(sent) == 2
+
+
+def test_rejected_coroutine_blocked(answer_approvals, async_critical_operation):
+    """Test that rejected coroutines are not awaited."""
+    answer_approvals("Rejected", "admin@example.com")
+
+    secured_operation = approval_gate_async(
+        agent_name=AGENT_NAME,
+        action_description=ACTION_DESC,
+        approver_emails=APPROVER_EMAILS
+    )(async_critical_operation)
+
+    result = asyncio.run(secured_operation("database-prod", confirm=True))
+
+    assert async_critical_operation.call_count == 0
+    assert result == DEFAULT_REFUSAL_VALUE
+
 
+def test_regular_function_rejected():
+    """Test that approval_gate_async refuses to wrap a regular function."""
+    def regular_operation(resource_id):
+        return resource_id
 
-if __name__ == '__main__':
-    unittest.main()
+    with pytest.raises(TypeError):
+        approval_gate_async(
+            agent_name=AGENT_NAME,
+            action_description=ACTION_DESC,
+            approver_emails=APPROVER_EMAILS
+        )(regular_operation)
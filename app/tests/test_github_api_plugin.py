@@ -0,0 +1,196 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+
+"""
+Tests for github_api_plugin.py module in the sk_demo package.
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from sk_demo import github_api_plugin
+from sk_demo.constants import SEARCH_RATE_LIMIT_PER_TOKEN, SEARCH_RATE_PERIOD_SECONDS
+from sk_demo.github_api_plugin import GitHubPlugin, RateLimiter, TokenPool
+
+SEARCH_URL = "https://api.github.com/search/code"
+
+
+def make_response(status_code, content=b"", headers=None):
+    """Build a stand-in for a requests.Response."""
+    return MagicMock(status_code=status_code, content=content, headers=headers or {})
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the plugin's clock with one that only moves when it sleeps; returns the list of sleeps."""
+    clock = {"now": 1000.0}
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(github_api_plugin, "time", SimpleNamespace(
+        monotonic=lambda: clock["now"], time=lambda: clock["now"], sleep=sleep
+    ))
+    return sleeps
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Replace the shared HTTP session, so no test reaches api.github.com."""
+    mock = MagicMock()
+    monkeypatch.setattr(github_api_plugin, "_SESSION", mock)
+    return mock
+
+
+@pytest.fixture
+def plugin(monkeypatch, session):  #pylint: disable=unused-argument
+    """A plugin with two tokens and empty response caches."""
+    monkeypatch.setenv("GITHUB_TOKEN", "token-a")
+    monkeypatch.setenv("GITHUB_TOKENS", "token-b")
+    monkeypatch.setattr(github_api_plugin, "_SEARCH_CACHE", github_api_plugin.OrderedDict())
+    monkeypatch.setattr(github_api_plugin, "_ETAG_CACHE", {})
+    monkeypatch.setattr(github_api_plugin, "_DEFAULT_BRANCH_CACHE", {})
+    return GitHubPlugin()
+
+
+def test_rate_limiter_waits_for_oldest_call_to_leave_window(fake_clock):
+    """Test that a call over the limit waits until the window has room again."""
+    limiter = RateLimiter(2, 10)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert not fake_clock
+
+    limiter.acquire()
+    assert fake_clock == [10]
+
+
+def test_search_rate_scales_with_tokens(plugin):
+    """Test that code searches are paced to GitHub's per-token limit for every token."""
+    assert plugin.search_limiter.max_calls == SEARCH_RATE_LIMIT_PER_TOKEN * 2
+    assert plugin.search_limiter.period_seconds == SEARCH_RATE_PERIOD_SECONDS
+
+
+def test_search_not_paced_without_token(monkeypatch, session):  #pylint: disable=unused-argument
+    """Test that there is no search limiter without a token, since code search requires one."""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+
+    assert GitHubPlugin().search_limiter is None
+
+
+def test_conditional_get_reuses_cached_body_on_304(plugin, session):
+    """Test that a 304 Not Modified is answered with the body cached for its ETag."""
+    session.get.side_effect = [
+        make_response(200, b'{"total_count": 1}', {"ETag": '"v1"', "Content-Type": "application/json"}),
+        make_response(304),
+    ]
+
+    first = plugin._conditional_get(SEARCH_URL, {"q": "test"})
+    second = plugin._conditional_get(SEARCH_URL, {"q": "test"})
+
+    assert first == (200, "application/json", b'{"total_count": 1}')
+    assert second == first
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_etag_cache_evicts_oldest_response(plugin, session, monkeypatch):
+    """Test that the ETag cache drops its oldest response when full."""
+    monkeypatch.setattr(github_api_plugin, "ETAG_CACHE_MAX_ENTRIES", 2)
+    session.get.side_effect = [
+        make_response(200, b"{}", {"ETag": f'"v{index}"'}) for index in range(3)
+    ]
+
+    for query in ("first", "second", "third"):
+        plugin._conditional_get(SEARCH_URL, {"q": query})
+
+    cached_queries = [dict(key[1])["q"] for key in github_api_plugin._ETAG_CACHE]
+    assert cached_queries == ["second", "third"]
+
+
+@pytest.mark.parametrize("status_code", [403, 429])
+def test_token_pool_skips_used_up_token(fake_clock, status_code):  #pylint: disable=unused-argument
+    """Test that a token whose rate limit ran out is skipped until it resets."""
+    pool = TokenPool(["token-a", "token-b"])
+    now = github_api_plugin.time.time()
+
+    assert pool.next_token() == "token-a"
+    pool.report("token-a", make_response(
+        status_code, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(now) + 60)}
+    ))
+
+    assert pool.next_token() == "token-b"
+    assert pool.next_token() == "token-b"
+
+    github_api_plugin.time.sleep(60)
+    assert pool.next_token() == "token-a"
+
+
+def test_token_pool_keeps_token_with_remaining_limit():
+    """Test that a 403 without a used-up rate limit does not take the token out of turn."""
+    pool = TokenPool(["token-a", "token-b"])
+
+    assert pool.next_token() == "token-a"
+    pool.report("token-a", make_response(403, headers={"X-RateLimit-Remaining": "12"}))
+
+    assert pool.next_token() == "token-b"
+    assert pool.next_token() == "token-a"
+
+
+def test_search_cache_evicts_least_recently_used(plugin, monkeypatch):
+    """Test that a search used again is kept over an older unused one."""
+    monkeypatch.setattr(github_api_plugin, "SEARCH_CACHE_MAX_ENTRIES", 2)
+    fetched = []
+
+    def fake_fetch(query, page, per_page):  #pylint: disable=unused-argument
+        fetched.append(query)
+        return {"status": "success", "total_count": 0, "items": []}
+
+    monkeypatch.setattr(plugin, "_fetch_search_results", fake_fetch)
+
+    for query in ("first", "second", "first", "third", "first", "second"):
+        plugin._search_code(query, 1, 10)
+
+    assert fetched == ["first", "second", "third", "second"]
+
+
+def test_default_branch_contents_follow_file_order(plugin, session):
+    """Test that GraphQL file contents come back in the order of the files, with None for missing ones."""
+    session.post.return_value = make_response(200, orjson.dumps({"data": {
+        "file1": {"object": {"text": "second"}},
+        "file0": {"object": {"text": "first"}},
+        "file2": {"object": None},
+    }}))
+
+    contents = plugin._get_default_branch_contents([("o/r", "a.py"), ("o/r", "b.py"), ("o/r", "c.py")])
+
+    assert contents == ["first", "second", None]
+
+
+def test_search_code_batch_keeps_query_order(plugin, monkeypatch):
+    """Test that batch results follow the query order, not the order the searches finish in."""
+    queries = ["slow", "fast"]
+    fast_done = threading.Event()
+    finished = []
+
+    def fake_search(query, page, per_page):  #pylint: disable=unused-argument
+        if query == "slow":
+            fast_done.wait(timeout=1)
+        finished.append(query)
+        if query == "fast":
+            fast_done.set()
+        return {"status": "success", "total_count": 1, "items": [{"path": query}]}
+
+    monkeypatch.setattr(plugin, "_search_code", fake_search)
+
+    result = orjson.loads(plugin.search_code_batch(queries))
+
+    assert finished == ["fast", "slow"]
+    assert [entry["query"] for entry in result["results"]] == queries
+    assert [entry["items"][0]["path"] for entry in result["results"]] == queries
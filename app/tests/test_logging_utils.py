@@ -5,78 +5,155 @@
 Tests for logging_utils.py module in the human_oversight package.
 """
 
-import unittest
+import logging
 from unittest.mock import patch
-import json
 from datetime import datetime, timezone
 
+import orjson
+import pytest
+
 from human_oversight.logging_utils import (
+    ISO_TIMESTAMP_FORMAT,
+    disable_background_logging,
+    enable_background_logging,
     log_approval_event,
+    package_logger,
     create_initial_log_event,
     get_current_timestamp
 )
 
+AGENT_NAME = "TestAgent"
+CORRELATION_ID = "test-correlation-id"
+ACTION_DESC = "Test Action"
+MOCK_TIMESTAMP = "2025-04-13T12:00:00.000000Z"
+
+
+@pytest.fixture
+def parameters():
+    """Parameters of the gated call being logged."""
+    return {"param1": "value1", "param2": 123}
+
+
+@patch('human_oversight.logging_utils.logger')
+def test_log_approval_event(mock_logger):
+    """Test logging of approval events."""
+    event_data = {
+        "PartitionKey": AGENT_NAME,
+        "RowKey": CORRELATION_ID,
+        "Status": "Initiated",
+        "ActionDescription": ACTION_DESC
+    }
+
+    log_approval_event(event_data)
+
+    # Check that logger.info was called once with the event serialized as JSON
+    mock_logger.info.assert_called_once()
+    message, serialized_event = mock_logger.info.call_args[0]
+    assert message == "Approval Event: %s"
+    assert orjson.loads(serialized_event) == event_data
+
+
+@patch('human_oversight.logging_utils.logger')
+def test_log_approval_event_non_str_keys(mock_logger):
+    """Test that events with non-string keys in their parameters can be logged."""
+    log_approval_event({"PartitionKey": AGENT_NAME, "Parameters": {"labels": {1: "a"}}})
+
+    _, serialized_event = mock_logger.info.call_args[0]
+    assert orjson.loads(serialized_event)["Parameters"] == {"labels": {"1": "a"}}
+
+
+@patch('human_oversight.logging_utils.orjson.dumps')
+@patch('human_oversight.logging_utils.logger')
+def test_log_approval_event_disabled(mock_logger, mock_dumps):
+    """Test that events are not serialized when INFO logging is disabled."""
+    mock_logger.isEnabledFor.return_value = False
+
+    log_approval_event({"PartitionKey": AGENT_NAME, "Status": "Initiated"})
+
+    mock_dumps.assert_not_called()
+    mock_logger.info.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_timestamp")
+def test_create_initial_log_event(parameters):
+    """Test creation of initial log event."""
+    log_event = create_initial_log_event(AGENT_NAME, CORRELATION_ID, ACTION_DESC, parameters)
+
+    assert log_event["PartitionKey"] == AGENT_NAME
+    assert log_event["RowKey"] == CORRELATION_ID
+    assert log_event["Status"] == "Initiated"
+    assert log_event["Timestamp"] == MOCK_TIMESTAMP
+    assert log_event["ActionDescription"] == ACTION_DESC
+    assert log_event["Parameters"] == parameters
+
+
+def test_get_current_timestamp(monkeypatch):
+    """Test timestamp generation."""
+    # 2025-04-13T12:00:00.123456Z expressed in nanoseconds since the epoch
+    test_dt = datetime(2025, 4, 13, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    now_ns = int(test_dt.timestamp()) * 1_000_000_000 + 123456789
+    monkeypatch.setattr('human_oversight.logging_utils.time.time_ns', lambda: now_ns)
+
+    timestamp = get_current_timestamp()
+
+    assert timestamp == "2025-04-13T12:00:00.123456Z"
+    assert datetime.strptime(timestamp, ISO_TIMESTAMP_FORMAT) == test_dt.replace(tzinfo=None)
+
+
+def test_create_initial_log_event_with_timestamp(mock_timestamp, parameters):
+    """Test that an explicit timestamp is used instead of the current time."""
+    log_event = create_initial_log_event(AGENT_NAME, CORRELATION_ID, ACTION_DESC, parameters, MOCK_TIMESTAMP)
+
+    mock_timestamp.assert_not_called()
+    assert log_event["Timestamp"] == MOCK_TIMESTAMP
+
+
+class _RecordingHandler(logging.Handler):
+    """Handler keeping the records it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def background_logging():
+    """Turn background logging off again after the test."""
+    yield
+    disable_background_logging()
+
+
+@pytest.mark.usefixtures("background_logging")
+def test_records_emitted_by_listener():
+    """Test that approval events reach the handler through the queue."""
+    handler = _RecordingHandler()
+    enable_background_logging(handler)
+    # Enabling twice must not install a second queue handler
+    enable_background_logging(handler)
+
+    previous_level = package_logger.level
+    package_logger.setLevel(logging.INFO)
+    try:
+        log_approval_event({"PartitionKey": "TestAgent", "Status": "Initiated"})
+    finally:
+        package_logger.setLevel(previous_level)
+
+    assert not package_logger.propagate
+    disable_background_logging()
+
+    assert package_logger.propagate
+    assert len(handler.records) == 1
+    assert '"Status":"Initiated"' in handler.records[0].getMessage()
+
+
+def test_background_logging_requires_handlers(monkeypatch):
+    """Test that records are not silently dropped when there is no handler to write them."""
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
+
+    with pytest.raises(ValueError):
+        enable_background_logging()
 
-class TestLoggingUtils(unittest.TestCase):
-    """Test logging utility functions."""
-
-    def setUp(self):
-        self.agent_name = "TestAgent"
-        self.correlation_id = "test-correlation-id"
-        self.action_desc = "Test Action"
-        self.parameters = {"param1": "value1", "param2": 123}
-        self.mock_timestamp = "2025-04-13T12:00:00.000000Z"
-
-    @patch('human_oversight.logging_utils.logger')
-    def test_log_approval_event(self, mock_logger):
-        """Test logging of approval events."""
-        event_data = {
-            "PartitionKey": self.agent_name,
-            "RowKey": self.correlation_id,
-            "Status": "Initiated",
-            "ActionDescription": self.action_desc
-        }
-
-        log_approval_event(event_data)
-
-        # Check that logger.info was called with the correct format and arguments
-        mock_logger.info.assert_called_once_with(
-            "Approval Event: %s", 
-            json.dumps(event_data)
-        )
-
-    @patch('human_oversight.logging_utils.get_current_timestamp')
-    def test_create_initial_log_event(self, mock_timestamp):
-        """Test creation of initial log event."""
-        mock_timestamp.return_value = self.mock_timestamp
-
-        log_event = create_initial_log_event(
-            self.agent_name,
-            self.correlation_id,
-            self.action_desc,
-            self.parameters
-        )
-
-        self.assertEqual(log_event["PartitionKey"], self.agent_name)
-        self.assertEqual(log_event["RowKey"], self.correlation_id)
-        self.assertEqual(log_event["Status"], "Initiated")
-        self.assertEqual(log_event["Timestamp"], self.mock_timestamp)
-        self.assertEqual(log_event["ActionDescription"], self.action_desc)
-        self.assertEqual(log_event["Parameters"], self.parameters)
-
-    @patch('human_oversight.logging_utils.datetime')
-    def test_get_current_timestamp(self, mock_datetime):
-        """Test timestamp generation."""
-        # Create a fixed datetime for testing
-        test_dt = datetime(2025, 4, 13, 12, 0, 0, tzinfo=timezone.utc)
-        mock_datetime.now.return_value = test_dt
-        mock_datetime.timezone = timezone
-
-        timestamp = get_current_timestamp()
-
-        mock_datetime.now.assert_called_once_with(timezone.utc)
-        self.assertEqual(timestamp, test_dt.isoformat())
-
-
-if __name__ == '__main__':
-    unittest.main()
+    assert package_logger.propagate
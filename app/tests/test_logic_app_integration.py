@@ -5,23 +5,106 @@
 Tests for integration with Logic Apps.
 """
 
+import concurrent.futures
 import unittest
 import os
 import uuid
 import time
 import json
 import logging
-import datetime
+import functools
+import itertools
+import random
+import socket
+from urllib.parse import urlsplit
+
+import orjson
+import pytest
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Configure logging
-logging.basicConfig(level=logging.INFO,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once, when the module is imported, and only read
+# the .env file if the environment (e.g. a CI runner) does not set them all
+_SETTINGS = ('RUN_INTEGRATION_TEST', 'HO_LOGIC_APP_URL', 'APPROVER_EMAILS')
+if not all(os.getenv(name) for name in _SETTINGS):
+    from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+    load_dotenv()
+_RUN_INTEGRATION_TEST = os.getenv('RUN_INTEGRATION_TEST', '').lower() == 'true'
+_LOGIC_APP_URL = os.getenv('HO_LOGIC_APP_URL')
+_APPROVER_EMAILS = tuple(
+    email.strip() for email in os.getenv('APPROVER_EMAILS', '').split(',') if email.strip()
+)
+
+# Waiting for the manual approval takes 5 minutes at most, status polls back off
+# from 1s up to 20s with up to 25% random jitter
+POLL_TIMEOUT_SECONDS = 300
+POLL_INITIAL_DELAY_SECONDS = 1.0
+POLL_MAX_DELAY_SECONDS = 20.0
+POLL_JITTER_RATIO = 0.25
+
+# Payloads are serialized with orjson and posted as bytes
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Fields every Logic App answer has, whatever the decision
+_RESPONSE_REQUIRED_KEYS = frozenset({"correlationId", "status"})
+
+# Approvers get their email test requests concurrently, at most this many at once
+MAX_CONCURRENT_SUBMISSIONS = 4
+
+# Connectivity check before the tests gives up after 1s
+PROBE_TIMEOUT_SECONDS = 1
+
+# Local time shown in the test email subjects
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Test IDs are a per-process random prefix and a counter, unique across runs
+_TEST_ID_PREFIX = uuid.uuid4().hex
+_TEST_ID_COUNTER = itertools.count()
+
+# Let pytest skip the whole module when collecting it, before any setup runs
+pytestmark = pytest.mark.skipif(
+    not _RUN_INTEGRATION_TEST,
+    reason="Integration tests are disabled. Set RUN_INTEGRATION_TEST=true to enable them."
+)
+
+
+def _next_test_id():
+    """Return a new ID to correlate a test request with its logs and emails."""
+    return f"{_TEST_ID_PREFIX}-{next(_TEST_ID_COUNTER)}"
+
+
+class _LazyJson:
+    """Pretty-print an object as JSON only when a log record is emitted."""
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return json.dumps(self.obj, indent=2)
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_logic_app(url):
+    """
+    Check once per process that the Logic App URL can be reached.
+
+    Returns None on success or the connection error message.
+    """
+    parsed_url = urlsplit(url)
+    port = parsed_url.port or (443 if parsed_url.scheme == 'https' else 80)
+    try:
+        # Just open a TCP connection, which is much cheaper than a HEAD request
+        # and does not trigger the Logic App
+        with socket.create_connection((parsed_url.hostname, port), timeout=PROBE_TIMEOUT_SECONDS):
+            pass
+    except OSError as exception:
+        return str(exception)
+    logger.info("Successfully connected to Logic App URL: %s", url)
+    return None
+
 
 class LogicAppIntegrationTest(unittest.TestCase):
     """
@@ -41,97 +124,120 @@ class LogicAppIntegrationTest(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test environment once for all tests."""
-        # Check if integration tests should run
-        run_integration_tests = os.getenv('RUN_INTEGRATION_TEST', '').lower() == 'true'
-        if not run_integration_tests:
+        # Check if integration tests should run (pytest already skips via pytestmark)
+        if not _RUN_INTEGRATION_TEST:
             raise unittest.SkipTest(
                 "Integration tests are disabled. Set RUN_INTEGRATION_TEST=true "
                 "environment variable to enable these tests."
             )
 
         # Check if required environment variables are set
-        cls.logic_app_url = os.getenv('HO_LOGIC_APP_URL')
+        cls.logic_app_url = _LOGIC_APP_URL
         if not cls.logic_app_url:
             raise unittest.SkipTest(
                 "HO_LOGIC_APP_URL environment variable not set. "
                 "Set this variable to run integration tests."
             )
 
-        approver_emails_str = os.getenv('APPROVER_EMAILS')
-        if not approver_emails_str:
+        cls.approver_emails = _APPROVER_EMAILS
+        if not cls.approver_emails:
             raise unittest.SkipTest(
                 "APPROVER_EMAILS environment variable not set. "
                 "Set this variable with comma-separated emails to run integration tests."
             )
-        cls.approver_emails = [email.strip() for email in approver_emails_str.split(',')]
 
         # Check if we can access the Logic App URL
-        try:
-            # Just a HEAD request to check connectivity without triggering the Logic App
-            requests.head(cls.logic_app_url, timeout=5)
-            logger.info("Successfully connected to Logic App URL: %s", cls.logic_app_url)
-        except requests.RequestException as exception:
+        probe_error = _probe_logic_app(cls.logic_app_url)
+        if probe_error is not None:
             raise unittest.SkipTest(
-                f"Could not connect to Logic App URL: {exception}"
+                f"Could not connect to Logic App URL: {probe_error}"
             )
 
+        # One session for all requests so the TLS connection is reused while polling.
+        # Retry keeps its default methods, so the approval POST is never sent twice,
+        # and waits as long as a Retry-After header asks for when throttled
+        cls.session = requests.Session()
+        retry = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        cls.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_SUBMISSIONS, max_retries=retry))
+
         logger.info("Integration test setup complete")
 
-    def test_logic_app_sends_approval_email(self):
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared session."""
+        cls.session.close()
+
+    def _create_payload(self, agent_name, action_description, approver_emails=None, **parameters):
         """
-        Test that the Logic App sends an approval email when triggered.
-        
-        This test sends a real request to the Logic App, which will trigger
-        a real email to be sent to the approver(s). You will need to manually
-        check your email to confirm receipt.
-        
-        Note: This test doesn't wait for approval or check the result.
-        It just verifies that the Logic App accepts the request without errors.
+        Build an approval request with a new test ID, returned with the payload.
+
+        The request goes to all configured approvers unless approver_emails is given.
         """
         # Generate a unique test ID (important for tracking in logs/emails)
-        test_id = str(uuid.uuid4())
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Prepare the request payload
+        test_id = _next_test_id()
         payload = {
-            "agentName": "IntegrationTestAgent",
-            "actionDescription": f"Logic App Test [{timestamp}]",
+            "agentName": agent_name,
+            "actionDescription": action_description,
             "parameters": {
                 "testId": test_id,
-                "timestamp": timestamp,
-                "isTest": True
+                "isTest": True,
+                **parameters
             },
-            "approverEmails": self.approver_emails,
+            "approverEmails": approver_emails or self.approver_emails,
             "correlationId": test_id
         }
+        return test_id, payload
 
-        logger.info("Sending test request to Logic App with ID: %s", test_id)
-        logger.info("Request payload: %s", json.dumps(payload, indent=2))
+    def _submit_and_poll(self, payload, manual=False):
+        """
+        Send an approval request to the Logic App and return its JSON answer.
 
+        Without manual, the answer must arrive within 30 seconds. With manual,
+        the Logic App answers once the approver responded, so the request waits
+        up to POLL_TIMEOUT_SECONDS, following a 202 status URL if one is returned.
+        """
+        logger.info("Request payload: %s", _LazyJson(payload))
         try:
-            # Send the request to the Logic App
-            response = requests.post(
+            deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+            response = self.session.post(
                 self.logic_app_url,
-                json=payload,
-                timeout=30  # Give it a reasonable timeout
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=POLL_TIMEOUT_SECONDS if manual else 30
             )
 
+            # A long running run may be answered with 202 and a status URL instead;
+            # poll that URL rather than posting again, which would send another email
+            delay = POLL_INITIAL_DELAY_SECONDS
+            while manual and response.status_code == 202 and time.monotonic() < deadline:
+                status_url = response.headers.get("Location")
+                self.assertIsNotNone(status_url, "202 response without a Location header")
+                logger.info("Still waiting for approval (next poll in %ss)...", delay)
+
+                # Back off exponentially so a quick approval is seen quickly, jittered
+                # so that concurrent runs do not poll in lockstep
+                jitter = random.uniform(0, POLL_JITTER_RATIO * delay)
+                time.sleep(min(delay + jitter, max(deadline - time.monotonic(), 0)))
+                delay = min(delay * 2, POLL_MAX_DELAY_SECONDS)
+                response = self.session.get(status_url, timeout=30)
+
+            if manual and response.status_code == 202:
+                # If we got here, the test timed out waiting for approval
+                logger.error("Timed out waiting for approval")
+                self.fail("Test failed: Timed out waiting for approval")
+
             # Check if request was accepted
             response.raise_for_status()
-
             logger.info("Request accepted by Logic App. Status code: %s", response.status_code)
-            logger.info("Response: %s", response.text)
-
-            # Validate response format (without checking approval status)
-            response_data = response.json()
-            self.assertIn("correlationId", response_data)
-            self.assertEqual(test_id, response_data["correlationId"])
-            self.assertIn("status", response_data)
 
-            # Log the important information for manual verification
-            logger.info("✓ Test request successfully sent to Logic App")
-            logger.info("✓ Please check approver email (%s) for an approval request", ', '.join(self.approver_emails))
-            logger.info("✓ The email subject should contain: Logic App Test [%s]", timestamp)
+            response_data = orjson.loads(response.content)
+            logger.info("Response: %s", _LazyJson(response_data))
+            return response_data
 
         except requests.RequestException as exception:
             logger.error("Error sending request to Logic App: %s", exception)
@@ -140,13 +246,53 @@ class LogicAppIntegrationTest(unittest.TestCase):
                 logger.error("Response content: %s", exception.response.text)
             raise
 
+    def test_logic_app_sends_approval_email(self):
+        """
+        Test that the Logic App sends an approval email when triggered.
+        
+        This test sends a real request to the Logic App, which will trigger
+        a real email to be sent to the approver(s). You will need to manually
+        check your email to confirm receipt.
+        
+        Note: This test doesn't wait for approval or check the result.
+        It just verifies that the Logic App accepts the request without errors.
+        """
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
+
+        # Each approver gets a request of their own, sent concurrently, so the
+        # test takes as long as the slowest request rather than their sum
+        requests_by_id = dict(
+            self._create_payload(
+                "IntegrationTestAgent", f"Logic App Test [{timestamp}]", [email], timestamp=timestamp
+            )
+            for email in self.approver_emails
+        )
+        logger.info("Sending test requests to Logic App with IDs: %s", ', '.join(requests_by_id))
+
+        max_workers = min(MAX_CONCURRENT_SUBMISSIONS, len(requests_by_id))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses_by_id = dict(zip(
+                requests_by_id,
+                executor.map(self._submit_and_poll, requests_by_id.values())
+            ))
+
+        # Validate response format (without checking approval status)
+        for test_id, response_data in responses_by_id.items():
+            self.assertLessEqual(_RESPONSE_REQUIRED_KEYS, response_data.keys())
+            self.assertEqual(test_id, response_data["correlationId"])
+
+        # Log the important information for manual verification
+        logger.info("✓ Test request successfully sent to Logic App")
+        logger.info("✓ Please check approver email (%s) for an approval request", ', '.join(self.approver_emails))
+        logger.info("✓ The email subject should contain: Logic App Test [%s]", timestamp)
+
     def test_logic_app_approval_flow(self):
         """
         Test the complete Logic App approval flow with manual interaction.
         
         This test sends a request to the Logic App and then waits for manual
-        approval via email. The test will poll the Logic App periodically for
-        up to 5 minutes, waiting for approval.
+        approval via email. The Logic App answers the request once it was
+        approved, and the test waits up to 5 minutes for that answer.
         
         IMPORTANT: When you run this test, you will need to:
         1. Check your email for the approval request
@@ -159,94 +305,35 @@ class LogicAppIntegrationTest(unittest.TestCase):
         if os.getenv('CI') == 'true':
             self.skipTest("Skipping manual approval test in CI environment")
 
-        # Generate a unique test ID (important for tracking in logs/emails)
-        test_id = str(uuid.uuid4())
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Prepare the request payload - use very clear description for manual test
-        payload = {
-            "agentName": "ManualApprovalTest",
-            "actionDescription": f"PLEASE APPROVE THIS TEST [{timestamp}]",
-            "parameters": {
-                "testId": test_id,
-                "timestamp": timestamp,
-                "isTest": True,
-                "message": "This is an integration test - please approve this request"
-            },
-            "approverEmails": self.approver_emails,
-            "correlationId": test_id
-        }
+        # Use a very clear description for the manual test
+        timestamp = time.strftime(TIMESTAMP_FORMAT)
+        test_id, payload = self._create_payload(
+            "ManualApprovalTest",
+            f"PLEASE APPROVE THIS TEST [{timestamp}]",
+            timestamp=timestamp,
+            message="This is an integration test - please approve this request"
+        )
 
         logger.info("Sending manual approval test to Logic App with ID: %s", test_id)
         logger.info("IMPORTANT: Please check your email (%s)", ', '.join(self.approver_emails))
         logger.info("            and APPROVE the request with subject containing: PLEASE APPROVE THIS TEST [%s]", timestamp)
+        logger.info("Waiting for manual approval (up to 5 minutes)...")
 
-        try:
-            # Send the request to the Logic App
-            response = requests.post(
-                self.logic_app_url,
-                json=payload,
-                timeout=30
-            )
-
-            # Check if request was accepted
-            response.raise_for_status()
+        response_data = self._submit_and_poll(payload, manual=True)
+        status = response_data.get("status")
+        approver = response_data.get("approver")
 
-            logger.info("Request accepted by Logic App. Status code: %s", response.status_code)
-            initial_response = response.json()
-            logger.info("Initial response: %s", json.dumps(initial_response, indent=2))
-
-            # Now poll for up to 5 minutes waiting for approval
-            logger.info("Waiting for manual approval (up to 5 minutes)...")
-            logger.info("PLEASE CHECK YOUR EMAIL AND APPROVE THE REQUEST NOW")
-
-            max_retries = 30  # 30 retries * 10 seconds = 5 minutes
-            for i in range(max_retries):
-                # Wait before each retry (except first time)
-                if i > 0:
-                    time.sleep(10)  # Wait 10 seconds between retries
-
-                # Make the same request again to get current status
-                response = requests.post(
-                    self.logic_app_url,
-                    json=payload,
-                    timeout=30
-                )
-
-                if response.status_code != 200:
-                    logger.warning("Got non-200 response code: %s", response.status_code)
-                    continue
-
-                response_data = response.json()
-                status = response_data.get("status")
-                approver = response_data.get("approver")
-
-                logger.info("Poll %s/%s: Status = %s, Approver = %s", i+1, max_retries, status, approver)
-
-                # If we got a definitive status, we can break the loop
-                if status == "Approved":
-                    logger.info("✓ Request was APPROVED by %s", approver)
-                    self.assertEqual(status, "Approved")
-                    self.assertIsNotNone(approver)
-                    return
-                if status == "Rejected":
-                    logger.info("✗ Request was REJECTED by %s", approver)
-                    self.fail(f"Test failed: Request was rejected by {approver}")
-
-                # If it's still pending, continue looping
-                logger.info("Still waiting for approval (%s/%s)...", i+1, max_retries)
-
-            # If we got here, the test timed out waiting for approval
-            logger.error("Timed out waiting for approval")
-            self.fail("Test failed: Timed out waiting for approval")
+        if status == "Rejected":
+            logger.info("✗ Request was REJECTED by %s", approver)
+            self.fail(f"Test failed: Request was rejected by {approver}")
 
-        except requests.RequestException as exception:
-            logger.error("Error in approval flow test: %s", exception)
-            if hasattr(exception, 'response') and exception.response:
-                logger.error("Response status code: %s", exception.response.status_code)
-                logger.error("Response content: %s", exception.response.text)
-            raise
+        self.assertEqual(status, "Approved")
+        self.assertTrue(approver)
+        logger.info("✓ Request was APPROVED by %s", approver)
 
 
 if __name__ == '__main__':
+    # Show the progress messages when run directly, pytest shows them with --log-cli-level=INFO
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     unittest.main()